@@ -3,16 +3,28 @@ from tkinter import ttk, messagebox
 import csv
 import os
 import re
+import sys
+import threading
+import queue
+from bisect import insort
+from itertools import chain
+from atomic_csv import write_csv_atomically
+from enrollment_counts import EnrollmentCounts
+from search_index import SEARCH_DEBOUNCE_MS, SearchIndex, apply_treeview_filter
+from virtual_treeview import VirtualTreeview
 
 class Student:
+    __slots__ = ('id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code')
+
     def __init__(self, id: str, first_name: str,middle_name: str,last_name: str, lvl: str, gender: str, course_code: str) -> None:
         self.id = id
         self.first_name = first_name
         self.middle_name = middle_name
         self.last_name = last_name
-        self.lvl = lvl
-        self.gender = gender
-        self.course_code = course_code
+        # Low-cardinality fields are interned so a large roster shares one string per distinct value.
+        self.lvl = sys.intern(lvl)
+        self.gender = sys.intern(gender)
+        self.course_code = sys.intern(course_code)
     
     def __str__(self) -> str:
         return f'id: {self.id}, first_name: {self.first_name}, middle_name:{self.middle_name}, last_name: {self.last_name}, level: {self.lvl}, gender: {self.gender}, course code: {self.course_code}'
@@ -22,20 +34,467 @@ class Course:
         self.course_code = course_code
         self.course_name = course_name
 
-def load_students_from_csv():
-    students = []
-    try:
-        if os.path.isfile('students.csv') and os.path.getsize('students.csv') > 0:
-            with open('students.csv', mode='r') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    if all(field in row for field in ['id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code']):
-                        students.append(Student(row['id'], row['first_name'], row['middle_name'], row['last_name'], row['lvl'], row['gender'], row['course_code']))
-                    else:
-                        print("Error: Missing or incomplete data for a student in students.csv")
-    except FileNotFoundError:
-        pass
-    return students
+class DirtyTracker:
+    def __init__(self) -> None:
+        self.version = 0
+        self.saved_version = 0
+        self.writes_performed = 0
+        self.writes_skipped = 0
+
+    @property
+    def dirty(self) -> bool:
+        return self.version != self.saved_version
+
+    def mark_dirty(self):
+        self.version += 1
+
+    def write_stats(self):
+        return {'dirty': self.dirty, 'writes_performed': self.writes_performed, 'writes_skipped': self.writes_skipped}
+
+class CourseCatalog(DirtyTracker):
+    def __init__(self, courses=()) -> None:
+        super().__init__()
+        self._courses = []
+        self._codes = {}
+        for course in courses:
+            self._courses.append(course)
+            self._count_code(course.course_code, 1)
+
+    def __iter__(self):
+        return iter(self._courses)
+
+    def __len__(self) -> int:
+        return len(self._courses)
+
+    def _count_code(self, course_code, delta):
+        code = course_code.casefold()
+        count = self._codes.get(code, 0) + delta
+        if count > 0:
+            self._codes[code] = count
+        else:
+            self._codes.pop(code, None)
+
+    def has_course_code(self, course_code) -> bool:
+        return str(course_code).casefold() in self._codes
+
+    def add(self, course):
+        self._courses.append(course)
+        self._count_code(course.course_code, 1)
+        self.mark_dirty()
+        return course
+
+    def remove(self, course):
+        self._courses.remove(course)
+        self._count_code(course.course_code, -1)
+        self.mark_dirty()
+
+    def update(self, course, course_code, course_name):
+        self._count_code(course.course_code, -1)
+        course.course_code = course_code
+        course.course_name = course_name
+        self._count_code(course.course_code, 1)
+        self.mark_dirty()
+
+def normalize_course_code(course_code):
+    return str(course_code).strip().lower() if course_code else ""
+
+class StudentStore(DirtyTracker):
+    def __init__(self, students=()) -> None:
+        super().__init__()
+        self._records = {}
+        self._index = {}
+        self._by_course = {}
+        self._next_slot = 0
+        # Built on the first search rather than at load, so startup only pays for the records themselves.
+        self.search_index = None
+        self.counts = EnrollmentCounts()
+        # Rows the loader rejected, in STUDENT_FIELDS order; snapshots write them back so they are never lost.
+        self.rejected_rows = []
+        # Set when the file's header could not be read; snapshots are refused so its rows are not overwritten.
+        self.snapshot_error = None
+        for student in students:
+            self.add(student)
+        self.saved_version = self.version
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, id_number) -> bool:
+        return id_number in self._index
+
+    def get(self, id_number):
+        slots = self._index.get(id_number)
+        return self._records[slots[0]] if slots else None
+
+    def add(self, student):
+        slot = self._next_slot
+        self._next_slot += 1
+        self._records[slot] = student
+        self._index.setdefault(student.id, []).append(slot)
+        self.mark_dirty()
+        self._index_course(slot, student)
+        self._index_search(student)
+        self.counts.add(*enrollment_key(student))
+        return student
+
+    def _index_search(self, student):
+        if self.search_index is not None:
+            self.search_index.add(student, student_row(student))
+
+    def _unindex_search(self, student):
+        if self.search_index is not None:
+            self.search_index.remove(student)
+
+    def _index_course(self, slot, student):
+        self._by_course.setdefault(normalize_course_code(student.course_code), set()).add(slot)
+
+    def _unindex_course(self, slot, student):
+        code = normalize_course_code(student.course_code)
+        slots = self._by_course.get(code)
+        if slots is not None:
+            slots.discard(slot)
+            if not slots:
+                del self._by_course[code]
+
+    def _slot_of(self, student):
+        for slot in self._index.get(student.id, ()):
+            if self._records[slot] is student:
+                return slot
+        return None
+
+    def position(self, student):
+        # A record's rank among records sharing its ID. Slots are kept in file order, so it survives a reload.
+        for position, slot in enumerate(self._index.get(student.id, ())):
+            if self._records[slot] is student:
+                return position
+        return None
+
+    def _take_slot(self, id_number, position=0):
+        slots = self._index.get(id_number)
+        if not slots or position >= len(slots):
+            return None
+        slot = slots.pop(position)
+        if not slots:
+            del self._index[id_number]
+        return slot
+
+    def remove(self, id_number, position=0):
+        slot = self._take_slot(id_number, position)
+        if slot is None:
+            return None
+        student = self._records.pop(slot)
+        self.mark_dirty()
+        self._unindex_course(slot, student)
+        self._unindex_search(student)
+        self.counts.remove(*enrollment_key(student))
+        return student
+
+    def replace(self, old_id, student, position=0):
+        slot = self._take_slot(old_id, position)
+        if slot is None:
+            return self.add(student)
+        self._unindex_course(slot, self._records[slot])
+        self._unindex_search(self._records[slot])
+        self.counts.replace(enrollment_key(self._records[slot]), enrollment_key(student))
+        self._records[slot] = student
+        insort(self._index.setdefault(student.id, []), slot)
+        self.mark_dirty()
+        self._index_course(slot, student)
+        self._index_search(student)
+        return student
+
+    def set_course_code(self, student, course_code):
+        slot = self._slot_of(student)
+        if slot is not None:
+            self._unindex_course(slot, student)
+            self.counts.move_course(student.course_code, course_code, 1)
+        student.course_code = sys.intern(course_code)
+        self.mark_dirty()
+        if slot is not None:
+            self._index_course(slot, student)
+            self._index_search(student)
+
+    def search(self, query):
+        if self.search_index is None:
+            self.search_index = SearchIndex()
+            for student in self:
+                self.search_index.add(student, student_row(student))
+        return self.search_index.search(query)
+
+    def students_in_course(self, course_code):
+        return [self._records[slot] for slot in self._by_course.get(normalize_course_code(course_code), ())]
+
+    def check_counts(self):
+        return self.counts.differences(EnrollmentCounts((*enrollment_key(student), 1) for student in self))
+
+def enrollment_key(student):
+    return (student.course_code, student.lvl, student.gender)
+
+STUDENT_FIELDS = ["id", "first_name", "middle_name", "last_name", "lvl", "gender", "course_code"]
+JOURNAL_COMPACT_THRESHOLD = 1000
+JOURNAL_GENERATION_COLUMN = 'journal_generation='
+
+def student_row(student):
+    return [student.id, student.first_name, student.middle_name, student.last_name, student.lvl, student.gender, student.course_code]
+
+class StudentJournal:
+    INSERT = 'I'
+    UPDATE = 'U'
+    DELETE = 'D'
+
+    def __init__(self, path: str = 'students.journal', threshold: int = JOURNAL_COMPACT_THRESHOLD, worker=None) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.worker = worker
+        self.entries = 0
+        self.generation = 0
+
+    def record(self, op, student, students, old_id=None, position=None):
+        self.append([self.entry(op, student, students, old_id, position)], students)
+
+    def entry(self, op, student, students, old_id=None, position=None):
+        # Entries name the exact record by its ID and its position among records sharing that ID.
+        if position is None:
+            position = students.position(student)
+        return [op, self.generation, old_id if old_id is not None else student.id, position] + student_row(student)
+
+    def append(self, entries, students):
+        # A batch of entries is one worker task and one fsync, and triggers at most one compaction.
+        if not entries:
+            return
+        self._submit(lambda: self._append(entries))
+        self.entries += len(entries)
+        if self.entries >= self.threshold:
+            self.compact(students)
+
+    def _submit(self, task, key=None, message=None):
+        if self.worker is None:
+            task()
+            return False
+        return self.worker.submit(task, key, message)
+
+    def _append(self, entries):
+        with open(self.path, mode='a', newline='') as journal_file:
+            csv.writer(journal_file).writerows(entries)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+    def replay(self, students, snapshot_generation=0):
+        self.generation = snapshot_generation
+        if not os.path.isfile(self.path) or os.path.getsize(self.path) == 0:
+            return students
+        with open(self.path, mode='r', newline='') as journal_file:
+            for entry in csv.reader(journal_file):
+                # A torn final line from a crash mid-append is shorter than a full entry.
+                if len(entry) != len(STUDENT_FIELDS) + 4 or entry[0] not in (self.INSERT, self.UPDATE, self.DELETE) or not (entry[1].isdigit() and entry[3].isdigit()):
+                    print(f"Warning: Skipping incomplete entry in {self.path}")
+                    continue
+                op, generation, old_id, position, fields = entry[0], int(entry[1]), entry[2], int(entry[3]), entry[4:]
+                # The snapshot already holds every entry recorded before its compaction. Replaying one again is
+                # not harmless: with duplicate IDs a stale delete or ID change would hit the next record.
+                if generation < snapshot_generation:
+                    continue
+                self.generation = max(self.generation, generation)
+                if op == self.DELETE:
+                    students.remove(old_id, position)
+                    continue
+                student = Student(*fields)
+                if op == self.INSERT:
+                    students.add(student)
+                else:
+                    students.replace(old_id, student, position)
+        # Fold the replayed entries into a fresh snapshot so new appends never follow a torn line.
+        self.compact(students)
+        return students
+
+    def compact(self, students, message=None, force=True):
+        self.entries = 0
+        if students.snapshot_error:
+            print(f"Warning: {students.snapshot_error}")
+            return False
+        # The snapshot is copied now and stamped with a new generation. Entries recorded from here on carry that
+        # generation, so replay applies exactly the ones the snapshot does not hold.
+        self.generation += 1
+        generation = self.generation
+        rejected = list(students.rejected_rows)
+        return persist_store(students, 'students', lambda snapshot: self._write_compaction(snapshot, generation, rejected), message, submit=self._submit, force=force)
+
+    def _write_compaction(self, snapshot, generation, rejected=()):
+        write_students_csv(snapshot, generation, rejected)
+        with open(self.path, mode='w'):
+            pass
+
+PERSISTENCE_POLL_MS = 100
+
+class PersistenceWorker:
+    def __init__(self) -> None:
+        self._pending = []
+        self._completed = queue.Queue()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._stopping = False
+        self.report = None
+
+    def submit(self, task, key=None, message=None):
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='csv-persistence', daemon=True)
+                self._thread.start()
+            # A queued snapshot of the same store is dropped, so a burst of edits costs one write. The newer one
+            # still goes to the tail: moving it into the old slot would run it ahead of journal appends queued
+            # in between, and the compaction would then truncate the journal before those entries reach it.
+            coalesced = False
+            if key is not None:
+                for pending in self._pending:
+                    if pending[0] == key:
+                        self._pending.remove(pending)
+                        message = message or pending[2]
+                        coalesced = True
+                        break
+            self._pending.append([key, task, message])
+            self._condition.notify_all()
+            return coalesced
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    return
+                _, task, message = self._pending.pop(0)
+                self._busy = True
+            try:
+                task()
+                self._completed.put((message, None))
+            except Exception as e:
+                self._completed.put((message, e))
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self, timeout=None):
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def dispatch_completed(self):
+        while True:
+            try:
+                message, error = self._completed.get_nowait()
+            except queue.Empty:
+                return
+            if self.report is not None:
+                self.report(message, error)
+            elif error is not None:
+                print(f"Error saving data: {error}")
+
+persistence = PersistenceWorker()
+student_journal = StudentJournal(worker=persistence)
+
+ID_PATTERN = re.compile(r'\d{4}-\d{4}')
+# Any Unicode letter, matching what the add and edit forms accept ('JOSÉ' included).
+NAME_PATTERN = re.compile(r'[^\W\d_]+(?: +[^\W\d_]+)*')
+LEVEL_PATTERN = re.compile(r'[1-6]')
+GENDER_PATTERN = re.compile(r'[MF]')
+STORED_COURSE_CODE_PATTERN = re.compile(r'(?:[A-Z0-9-]{1,15})?')
+STUDENT_FIELD_RULES = [
+    (0, ID_PATTERN, "Invalid ID format, expected XXXX-XXXX"),
+    (1, NAME_PATTERN, "First name must contain only letters and spaces"),
+    (2, NAME_PATTERN, "Middle name must contain only letters and spaces"),
+    (3, NAME_PATTERN, "Last name must contain only letters and spaces"),
+    (4, LEVEL_PATTERN, "Year level must be a whole number between 1 and 6"),
+    (5, GENDER_PATTERN, "Gender must be 'M' or 'F'"),
+    (6, STORED_COURSE_CODE_PATTERN, "Course code must be up to 15 letters, digits or dashes"),
+]
+
+class CsvRowError:
+    def __init__(self, path: str, line_number: int, field: str, value: str, message: str) -> None:
+        self.path = path
+        self.line_number = line_number
+        self.field = field
+        self.value = value
+        self.message = message
+
+    def __str__(self) -> str:
+        if self.field is None:
+            return f'{self.path} line {self.line_number}: {self.message}'
+        return f'{self.path} line {self.line_number}: {self.message} ({self.field}={self.value!r})'
+
+class CsvHeaderError(CsvRowError):
+    pass
+
+def iter_students_from_csv(path='students.csv', errors=None, rejected=None):
+    if errors is None:
+        errors = []
+    if rejected is None:
+        rejected = []
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return
+
+    with open(path, mode='r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [field for field in STUDENT_FIELDS if field not in header]
+        if missing:
+            errors.append(CsvHeaderError(path, 1, None, None, f"Missing columns: {', '.join(missing)}"))
+            return
+        columns = [header.index(field) for field in STUDENT_FIELDS]
+        width = max(columns) + 1
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                errors.append(CsvRowError(path, reader.line_num, None, None, "Missing or incomplete data for a student"))
+                rejected.append([row[column] if column < len(row) else '' for column in columns])
+                continue
+
+            values = [row[column].strip() for column in columns]
+            values[5] = values[5].upper()
+            values[6] = values[6].upper()
+            for index, pattern, message in STUDENT_FIELD_RULES:
+                if not pattern.fullmatch(values[index]):
+                    errors.append(CsvRowError(path, reader.line_num, STUDENT_FIELDS[index], values[index], message))
+                    rejected.append([row[column] for column in columns])
+                    break
+            else:
+                yield Student(*values)
+
+def read_journal_generation(path='students.csv'):
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return 0
+    with open(path, mode='r', newline='') as csvfile:
+        header = next(csv.reader(csvfile), [])
+    for name in header:
+        if name.startswith(JOURNAL_GENERATION_COLUMN) and name[len(JOURNAL_GENERATION_COLUMN):].isdigit():
+            return int(name[len(JOURNAL_GENERATION_COLUMN):])
+    return 0
+
+def load_students_from_csv(errors=None):
+    if errors is None:
+        errors = []
+    rejected = []
+    students = StudentStore(iter_students_from_csv('students.csv', errors, rejected))
+    students.rejected_rows = rejected
+    for error in errors:
+        print(f"Error: {error}")
+    if rejected:
+        print(f"Warning: {len(rejected)} rejected row(s) are kept at the end of students.csv until they are fixed")
+    if any(isinstance(error, CsvHeaderError) for error in errors):
+        students.snapshot_error = "students.csv was not rewritten because its header could not be read; changes are kept in the journal until it is fixed"
+    return student_journal.replay(students, read_journal_generation('students.csv'))
 
 def load_courses_from_csv():
     courses = []
@@ -50,78 +509,130 @@ def load_courses_from_csv():
                         print("Error: Missing data in courses.csv")
     except FileNotFoundError:
         pass
-    return courses
-
-def save_students_to_csv(students):
-    with open('students.csv', mode='w', newline='') as csvfile:
-        fieldnames = ["id", "first_name", "middle_name", "last_name", "lvl", "gender", "course_code"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for student in students:
-            writer.writerow({"id": student.id, "first_name": student.first_name,"middle_name": student.middle_name, "last_name": student.last_name, "lvl": student.lvl, "gender": student.gender, "course_code": student.course_code})
-    messagebox.showinfo("Success", "Students data saved successfully.")
+    return CourseCatalog(courses)
+
+def write_students_csv(students, generation=0, rejected=()):
+    # The generation rides in an extra header column, which readers that look columns up by name ignore.
+    fieldnames = STUDENT_FIELDS + [f'{JOURNAL_GENERATION_COLUMN}{generation}'] if generation else STUDENT_FIELDS
+    rows = (student_row(student) for student in students)
+    write_csv_atomically('students.csv', fieldnames, chain(rows, rejected))
+
+def persist_store(store, key, write, message=None, submit=None, force=False):
+    if not store.dirty and not force:
+        store.writes_skipped += 1
+        return False
+
+    snapshot = list(store)
+    store.saved_version = store.version
+
+    def task():
+        try:
+            write(snapshot)
+        except Exception:
+            store.saved_version = -1
+            raise
+        store.writes_performed += 1
+
+    # A write that replaces one still waiting in the queue saves that write entirely.
+    if (submit or persistence.submit)(task, key, message):
+        store.writes_skipped += 1
+    return True
+
+def write_courses_csv(courses):
+    write_csv_atomically('courses.csv', ["course_code", "course_name"], ([course.course_code, course.course_name] for course in courses))
 
 def save_courses_to_csv(courses):
-    with open('courses.csv', mode='w', newline='') as csvfile:
-        fieldnames = ["course_code", "course_name"]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for course in courses:
-            writer.writerow({"course_code": course.course_code, "course_name": course.course_name})
-    messagebox.showinfo("Success", "Courses data saved successfully.")
+    return persist_store(courses, 'courses', write_courses_csv, "Courses data saved successfully.")
 
-def add_student(students, courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code):
-    if any(student.id == id_number for student in students):
-        messagebox.showerror("Error", "Student with this ID already exists.")
-        return
+NEW_ID_PATTERN = re.compile(r'\d{4}-\d{4}')
+NEW_COURSE_CODE_PATTERN = re.compile(r'[A-Z0-9-]{4,15}')
 
-    if not re.match(r'^\d{4}-\d{4}$', id_number):
-        messagebox.showerror("Error", "Invalid ID format. Please enter in the format XXXX-XXXX.")
-        return
+def validate_new_student(students, courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code):
+    if id_number in students:
+        return "Student with this ID already exists."
+    return validate_student_fields(courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code)
 
-    if not first_name.replace(" ", "").isalpha():
-        messagebox.showerror("Error", "Invalid name format. Please enter only alphabetic characters.")
-        return
-    
-    if not middle_name.replace(" ", "").isalpha():
-        messagebox.showerror("Error", "Invalid name format. Please enter only alphabetic characters.")
-        return
-    if not last_name.replace(" ", "").isalpha():
-        messagebox.showerror("Error", "Invalid name format. Please enter only alphabetic characters.")
-        return
+def validate_student_fields(courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code, current_course_code=None):
+    if not NEW_ID_PATTERN.fullmatch(id_number):
+        return "Invalid ID format. Please enter in the format XXXX-XXXX."
+
+    # The loader checks names with the same pattern, so anything saved here loads back.
+    for name in (first_name, middle_name, last_name):
+        if not NAME_PATTERN.fullmatch(name):
+            return "Invalid name format. Please enter only alphabetic characters."
 
     if not lvl.isdigit() or not 1 <= int(lvl) <= 6:
-        messagebox.showerror("Error", "Invalid year level. Please enter a single digit whole number between 1 and 6.")
-        return
+        return "Invalid year level. Please enter a single digit whole number between 1 and 6."
 
     if gender not in ('M', 'F'):
-        messagebox.showerror("Error", "Invalid gender. Please enter 'M' for Male or 'F' for Female.")
-        return
+        return "Invalid gender. Please enter 'M' for Male or 'F' for Female."
 
-    if not re.match(r'^[A-Z0-9-]{4,15}$', course_code):
-        messagebox.showerror("Error", "Invalid course code format. Please enter 4-15 alphanumeric characters.")
-        return
+    # An edit may keep a student's current course, including none after its course was deleted.
+    if current_course_code is not None and course_code == current_course_code:
+        return None
 
-    course_exist = any(course.course_code.lower() == course_code.lower() for course in courses)
+    if not NEW_COURSE_CODE_PATTERN.fullmatch(course_code):
+        return "Invalid course code format. Please enter 4-15 alphanumeric characters."
 
-    if not course_exist:
-        messagebox.showerror("Error", "Course Code does not exist")
+    if not courses.has_course_code(course_code):
+        return "Course Code does not exist"
+    return None
+
+def add_student(students, courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code):
+    error = validate_new_student(students, courses, id_number, first_name, middle_name, last_name, lvl, gender, course_code)
+    if error:
+        messagebox.showerror("Error", error)
         return
 
     student = Student(id_number, first_name, middle_name, last_name, lvl, gender, course_code)
-    students.append(student)
+    students.add(student)
 
-    save_students_to_csv(students)
-    save_courses_to_csv(courses)
+    student_journal.record(StudentJournal.INSERT, student, students)
     messagebox.showinfo("Success", "Student added successfully.")
 
-def delete_student(students, id_to_delete):
-    for student in students:
-        if student.id == id_to_delete:
-            students.remove(student)
-            save_students_to_csv(students) 
-            return True  
-    return False  
+def add_students_bulk(students, courses, rows):
+    results = []
+    entries = []
+    for row in rows:
+        # Each accepted row is added before the next is checked, so duplicates within the batch are caught too.
+        error = validate_new_student(students, courses, *row)
+        if error is None:
+            student = students.add(Student(*row))
+            entries.append(student_journal.entry(StudentJournal.INSERT, student, students))
+        results.append(error)
+    student_journal.append(entries, students)
+    return results
+
+def delete_student(students, id_to_delete, position=0):
+    student = students.remove(id_to_delete, position)
+    if student is None:
+        return False
+    student_journal.record(StudentJournal.DELETE, student, students, position=position)
+    return True
+
+def update_student(students, student, updated):
+    position = students.position(student)
+    if position is None:
+        return False
+    students.replace(student.id, updated, position)
+    student_journal.record(StudentJournal.UPDATE, updated, students, student.id, position)
+    return True
+
+def rename_course(students, courses, old_course_code, new_course_code, new_course_name):
+    for course in courses:
+        if course.course_code == old_course_code:
+            courses.update(course, new_course_code, new_course_name)
+
+            if new_course_code != old_course_code:
+                entries = []
+                for student in students.students_in_course(old_course_code):
+                    students.set_course_code(student, new_course_code)
+                    entries.append(student_journal.entry(StudentJournal.UPDATE, student, students))
+                student_journal.append(entries, students)
+
+            save_courses_to_csv(courses)
+            return True
+    return False
 
 def delete_course(students, courses, course_code):
     course_exists = False 
@@ -136,11 +647,12 @@ def delete_course(students, courses, course_code):
         return False  
 
 
-    for student in students:
-        if student.course_code.lower() == course_code.lower():
-            student.course_code = ""
+    entries = []
+    for student in students.students_in_course(course_code):
+        students.set_course_code(student, "")
+        entries.append(student_journal.entry(StudentJournal.UPDATE, student, students))
+    student_journal.append(entries, students)
 
-    save_students_to_csv(students)
     save_courses_to_csv(courses)
     return True  
 
@@ -148,6 +660,9 @@ def delete_course(students, courses, course_code):
 def sort_students_by_id(students):
     return sorted(students, key=lambda student: student.id)
 
+def student_values(student):
+    return (student.id, student.first_name, student.middle_name, student.last_name, student.lvl, student.gender, student.course_code if student.course_code else None)
+
 class Front(tk.Frame):
     def __init__(self, parent, controller):
         tk.Frame.__init__(self, parent)
@@ -160,6 +675,8 @@ class Front(tk.Frame):
         view_students.pack()
         view_courses = tk.Button(self, text="View Courses", command=lambda: controller.show_frame(ViewCourses))
         view_courses.pack()
+        view_summary = tk.Button(self, text="Enrollment Summary", command=lambda: controller.show_frame(EnrollmentSummary))
+        view_summary.pack()
 
 class ViewStudents(tk.Frame):
     def __init__(self, parent, controller):
@@ -167,6 +684,8 @@ class ViewStudents(tk.Frame):
         self.controller = controller
         label = tk.Label(self, text="Student List", font=("Arial", 18))
         label.pack(pady=10, padx=10)
+        self._search_job = None
+        self._rows = []
         self.search_var = tk.StringVar()
         self.search_var.trace("w", self.search_student) 
         self.search_entry = tk.Entry(self, textvariable=self.search_var)
@@ -179,8 +698,11 @@ class ViewStudents(tk.Frame):
         delete_st.pack(side=tk.RIGHT, padx=5, pady=10)
         add_st = tk.Button(self, text="Add Student", command=self.add_student)
         add_st.pack(side=tk.RIGHT, padx=5)
+        scrollbar = ttk.Scrollbar(self, orient='vertical')
+        scrollbar.pack(side=tk.RIGHT, fill='y')
         self.tree = ttk.Treeview(self, columns=('ID', 'First Name', 'Middle Name', 'Last Name', 'Level', 'Gender', 'Course Code'), show='headings')
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.virtual_tree = VirtualTreeview(self.tree, scrollbar, student_values)
         self.tree.heading('ID', text='ID')
         self.tree.heading('First Name', text='First Name')
         self.tree.heading('Middle Name', text='Middle Name')
@@ -198,24 +720,26 @@ class ViewStudents(tk.Frame):
         self.populate_treeview()
 
     def populate_treeview(self):
-        sorted_students = sort_students_by_id(students)
-        for student in sorted_students:
-            self.tree.insert('', tk.END, values=(student.id, student.first_name, student.middle_name, student.last_name, student.lvl, student.gender, student.course_code if student.course_code else None))
-            
+        self._rows = sort_students_by_id(students)
+        if self.search_var.get().strip():
+            self.apply_search()
+        else:
+            self.virtual_tree.set_rows(self._rows)
+
     def refresh_treeview(self):
-        self.tree.delete(*self.tree.get_children())
         self.populate_treeview()
 
     def search_student(self, *args):
-        search_query = self.search_var.get().lower()
-        if search_query:
-            self.tree.delete(*self.tree.get_children())
-            for student in students:
-                student_data = [str(student.id), student.first_name, student.middle_name, student.last_name, student.lvl, student.gender, student.course_code if student.course_code else None]
-                if any(search_query in str(data).lower() for data in student_data):
-                    self.tree.insert('', tk.END, values=student_data)
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        self._search_job = None
+        if self.search_var.get().strip():
+            self.virtual_tree.set_rows(sort_students_by_id(students.search(self.search_var.get())))
         else:
-            self.refresh_treeview()
+            self.virtual_tree.set_rows(self._rows)
     
     def add_student(self):
         add_window = tk.Toplevel(self)
@@ -278,15 +802,16 @@ class ViewStudents(tk.Frame):
 
         
     def delete_student(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        selected_rows = self.virtual_tree.selected_rows()
+        if not selected_rows:
             messagebox.showerror("Error", "Please select a student to delete.")
             return
 
         confirm = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this student?")
         if confirm:
-            student_id = self.tree.item(selected_item)['values'][0] 
-            success = delete_student(students, student_id) 
+            student = selected_rows[0]
+            position = students.position(student)
+            success = position is not None and delete_student(students, student.id, position)
             if success:
                 self.refresh_treeview()
                 messagebox.showinfo("Success", "Student deleted successfully.")
@@ -294,86 +819,86 @@ class ViewStudents(tk.Frame):
                 messagebox.showerror("Error", "Student not found.")
 
     def edit_student(self):
-        selected_item = self.tree.selection()
-        if not selected_item:
+        selected_rows = self.virtual_tree.selected_rows()
+        if not selected_rows:
             messagebox.showerror("Error", "Please select a student to edit.")
             return
 
-        student_id = self.tree.item(selected_item)['values'][0]
+        student = selected_rows[0]
+        if students.position(student) is None:
+            messagebox.showerror("Error", "Student not found.")
+            return
 
-        for student in students:
-            if student.id == student_id:
-                edit_window = tk.Toplevel(self)
-                edit_window.title("Edit Student")
-
-                tk.Label(edit_window, text="Edit Student", font=("Arial", 18)).pack(pady=10, padx=10)
-
-                tk.Label(edit_window, text="ID Number:").pack()
-                id_entry = tk.Entry(edit_window, width=30)
-                id_entry.insert(0, student.id) 
-                id_entry.pack()
-
-                tk.Label(edit_window, text="First Name:").pack()
-                first_name_entry = tk.Entry(edit_window, width=30)
-                first_name_entry.insert(0, student.first_name) 
-                first_name_entry.pack()
-
-                tk.Label(edit_window, text="Middle Name:").pack()
-                middle_name_entry = tk.Entry(edit_window, width=30)
-                middle_name_entry.insert(0, student.middle_name)
-                middle_name_entry.pack()
-
-                tk.Label(edit_window, text="Last Name:").pack()
-                last_name_entry = tk.Entry(edit_window, width=30)
-                last_name_entry.insert(0, student.last_name)
-                last_name_entry.pack()
-
-                tk.Label(edit_window, text="Year Level:").pack()
-                lvl_var = tk.StringVar(edit_window)
-                lvl_var.set(student.lvl) 
-                lvl_dropdown = tk.OptionMenu(edit_window, lvl_var, "1", "2", "3", "4", "5", "6")
-                lvl_dropdown.pack()
-
-                tk.Label(edit_window, text="Gender:").pack()
-                gender_var = tk.StringVar(edit_window)
-                gender_var.set(student.gender) 
-                gender_dropdown = tk.OptionMenu(edit_window, gender_var, "M", "F")
-                gender_dropdown.pack()
-
-                tk.Label(edit_window, text="Course Code:").pack()
-                course_entry = tk.Entry(edit_window, width=30)
-                course_entry.insert(0, student.course_code) 
-                course_entry.pack()
-
-                def save_changes():
-                    new_id = id_entry.get().strip().upper()
-                    new_first_name = first_name_entry.get().strip().upper()
-                    new_middle_name = middle_name_entry.get().strip().upper()
-                    new_last_name = last_name_entry.get().strip().upper()
-                    new_lvl = lvl_var.get().strip()
-                    new_gender = gender_var.get().strip().upper()
-                    new_course_code = course_entry.get().strip().upper()
-
-                    if new_id != student.id and any(s.id == new_id for s in students):
-                        messagebox.showerror("Error", "Student with this ID already exists.")
-                        return
-
-                    student.id = new_id
-                    student.first_name = new_first_name
-                    student.middle_name = new_middle_name
-                    student.last_name = new_last_name
-                    student.lvl = new_lvl
-                    student.gender = new_gender
-                    student.course_code = new_course_code
-
-                    save_students_to_csv(students)
-                    self.refresh_treeview()  
-                    messagebox.showinfo("Success", "Changes saved successfully.")
-                    edit_window.destroy()  
-
-                save_button = tk.Button(edit_window, text="Save Changes", command=save_changes)
-                save_button.pack(pady=10)
-                break  
+        edit_window = tk.Toplevel(self)
+        edit_window.title("Edit Student")
+
+        tk.Label(edit_window, text="Edit Student", font=("Arial", 18)).pack(pady=10, padx=10)
+
+        tk.Label(edit_window, text="ID Number:").pack()
+        id_entry = tk.Entry(edit_window, width=30)
+        id_entry.insert(0, student.id) 
+        id_entry.pack()
+
+        tk.Label(edit_window, text="First Name:").pack()
+        first_name_entry = tk.Entry(edit_window, width=30)
+        first_name_entry.insert(0, student.first_name) 
+        first_name_entry.pack()
+
+        tk.Label(edit_window, text="Middle Name:").pack()
+        middle_name_entry = tk.Entry(edit_window, width=30)
+        middle_name_entry.insert(0, student.middle_name)
+        middle_name_entry.pack()
+
+        tk.Label(edit_window, text="Last Name:").pack()
+        last_name_entry = tk.Entry(edit_window, width=30)
+        last_name_entry.insert(0, student.last_name)
+        last_name_entry.pack()
+
+        tk.Label(edit_window, text="Year Level:").pack()
+        lvl_var = tk.StringVar(edit_window)
+        lvl_var.set(student.lvl) 
+        lvl_dropdown = tk.OptionMenu(edit_window, lvl_var, "1", "2", "3", "4", "5", "6")
+        lvl_dropdown.pack()
+
+        tk.Label(edit_window, text="Gender:").pack()
+        gender_var = tk.StringVar(edit_window)
+        gender_var.set(student.gender) 
+        gender_dropdown = tk.OptionMenu(edit_window, gender_var, "M", "F")
+        gender_dropdown.pack()
+
+        tk.Label(edit_window, text="Course Code:").pack()
+        course_entry = tk.Entry(edit_window, width=30)
+        course_entry.insert(0, student.course_code) 
+        course_entry.pack()
+
+        def save_changes():
+            new_id = id_entry.get().strip().upper()
+            new_first_name = first_name_entry.get().strip().upper()
+            new_middle_name = middle_name_entry.get().strip().upper()
+            new_last_name = last_name_entry.get().strip().upper()
+            new_lvl = lvl_var.get().strip()
+            new_gender = gender_var.get().strip().upper()
+            new_course_code = course_entry.get().strip().upper()
+
+            if new_id != student.id and new_id in students:
+                messagebox.showerror("Error", "Student with this ID already exists.")
+                return
+
+            error = validate_student_fields(courses, new_id, new_first_name, new_middle_name, new_last_name, new_lvl, new_gender, new_course_code, student.course_code)
+            if error:
+                messagebox.showerror("Error", error)
+                return
+
+            updated = Student(new_id, new_first_name, new_middle_name, new_last_name, new_lvl, new_gender, new_course_code)
+            if not update_student(students, student, updated):
+                messagebox.showerror("Error", "Student not found.")
+                return
+            self.refresh_treeview()  
+            messagebox.showinfo("Success", "Changes saved successfully.")
+            edit_window.destroy()  
+
+        save_button = tk.Button(edit_window, text="Save Changes", command=save_changes)
+        save_button.pack(pady=10)
                 
 
 class ViewCourses(tk.Frame):
@@ -384,6 +909,10 @@ class ViewCourses(tk.Frame):
         label = tk.Label(self, text="Course List", font=("Arial", 18))
         label.pack(pady=10, padx=10)
         
+        self.search_index = SearchIndex()
+        self._search_job = None
+        self._rows = []
+        self._attached = set()
         self.search_var = tk.StringVar()
         self.search_var.trace("w", self.search_course)  
         self.search_entry = tk.Entry(self, textvariable=self.search_var)
@@ -411,22 +940,28 @@ class ViewCourses(tk.Frame):
         self.populate_treeview()
 
     def search_course(self, *args):
-        search_query = self.search_var.get().lower()
-        if search_query:
-            self.tree.delete(*self.tree.get_children())
-            for course in courses:
-                course_data = [course.course_code, course.course_name]
-                if any(search_query in str(data).lower() for data in course_data):
-                    self.tree.insert('', tk.END, values=course_data)
-        else:
-            self.refresh_treeview()
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(SEARCH_DEBOUNCE_MS, self.apply_search)
+
+    def apply_search(self):
+        self._search_job = None
+        matches = self.search_index.search(self.search_var.get())
+        self._attached = apply_treeview_filter(self.tree, self._rows, self._attached, matches)
 
     def populate_treeview(self):
+        self.search_index.clear()
         for course in courses:
-            self.tree.insert('', tk.END, values=(course.course_code, course.course_name))
+            iid = self.tree.insert('', tk.END, values=(course.course_code, course.course_name))
+            self.search_index.add(iid, (course.course_code, course.course_name))
+            self._rows.append(iid)
+        self._attached = set(self._rows)
+        if self.search_var.get().strip():
+            self.apply_search()
 
     def refresh_treeview(self):
-        self.tree.delete(*self.tree.get_children())
+        self.tree.delete(*self._rows)
+        self._rows = []
         self.populate_treeview()
     
     def add_course(self):
@@ -447,11 +982,15 @@ class ViewCourses(tk.Frame):
             course_code = code_entry.get().strip().upper()
             course_name = name_entry.get().strip().upper()
 
-            if any(course.course_code == course_code for course in courses):
+            if not NEW_COURSE_CODE_PATTERN.fullmatch(course_code):
+                messagebox.showerror("Error", "Invalid course code format. Please enter 4-15 alphanumeric characters.")
+                return
+
+            if courses.has_course_code(course_code):
                 messagebox.showerror("Error", "Course with this Course Code already exists.")
                 return
 
-            courses.append(Course(course_code, course_name))
+            courses.add(Course(course_code, course_name))
             save_courses_to_csv(courses)
             self.refresh_treeview() 
             messagebox.showinfo("Success", "Course added successfully.")
@@ -503,21 +1042,16 @@ class ViewCourses(tk.Frame):
             new_course_code = code_entry.get().strip().upper()
             new_course_name = name_entry.get().strip().upper()
 
-            for course in courses:
-                if course.course_code == old_course_code:
-                    course.course_code = new_course_code
-                    course.course_name = new_course_name
-
-                    for student in students:
-                        if student.course_code == old_course_code:
-                            student.course_code = new_course_code
+            # Students take the new code, so it must be one the student loader accepts.
+            if new_course_code != old_course_code and not NEW_COURSE_CODE_PATTERN.fullmatch(new_course_code):
+                messagebox.showerror("Error", "Invalid course code format. Please enter 4-15 alphanumeric characters.")
+                return
 
-                    save_courses_to_csv(courses)
-                    save_students_to_csv(students)
-                    self.refresh_treeview() 
-                    messagebox.showinfo("Success", "Course information updated successfully.")
-                    edit_window.destroy() 
-                    return
+            if rename_course(students, courses, old_course_code, new_course_code, new_course_name):
+                self.refresh_treeview() 
+                messagebox.showinfo("Success", "Course information updated successfully.")
+                edit_window.destroy() 
+                return
 
             messagebox.showinfo("Error", "Course not found.")
 
@@ -525,6 +1059,41 @@ class ViewCourses(tk.Frame):
         save_button.pack(pady=10)
 
 
+class EnrollmentSummary(tk.Frame):
+    def __init__(self, parent, controller):
+        tk.Frame.__init__(self, parent)
+        self.controller = controller
+        label = tk.Label(self, text="Enrollment Summary", font=("Arial", 18))
+        label.pack(pady=10, padx=10)
+        self.total_var = tk.StringVar()
+        tk.Label(self, textvariable=self.total_var).pack()
+        back_button = tk.Button(self, text="Back", command=lambda: controller.show_frame(Front))
+        back_button.pack()
+        check_button = tk.Button(self, text="Check Counts", command=self.check_counts)
+        check_button.pack(pady=5)
+        self.tree = ttk.Treeview(self, columns=('Group', 'Value', 'Students'), show='headings')
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.heading('Group', text='Group')
+        self.tree.heading('Value', text='Value')
+        self.tree.heading('Students', text='Students')
+
+    def refresh(self):
+        # Counts are kept by the store, so this never walks the roster.
+        summary = students.counts.snapshot()
+        self.total_var.set(f"Total students: {summary['total']}")
+        self.tree.delete(*self.tree.get_children())
+        for group, counts in (('Course', summary['by_course']), ('Level', summary['by_level']), ('Gender', summary['by_gender'])):
+            for value in sorted(counts):
+                self.tree.insert('', 'end', values=(group, value or "(none)", counts[value]))
+
+    def check_counts(self):
+        problems = students.check_counts()
+        if problems:
+            messagebox.showerror("Error", "Enrollment counts differ from a full recount:\n" + "\n".join(problems))
+        else:
+            messagebox.showinfo("Success", "Enrollment counts match a full recount.")
+
+
 class SampleApp(tk.Tk):
     def __init__(self, *args, **kwargs):
         tk.Tk.__init__(self, *args, **kwargs)
@@ -541,17 +1110,51 @@ class SampleApp(tk.Tk):
         students = load_students_from_csv()
         courses = load_courses_from_csv()
         
-        for F in (Front, ViewStudents, ViewCourses):
+        for F in (Front, ViewStudents, ViewCourses, EnrollmentSummary):
             frame = F(container, self)
             self.frames[F] = frame
             frame.grid(row=0, column=0, sticky="nsew")
         
+        self.status_var = tk.StringVar()
+        status_bar = tk.Label(self, textvariable=self.status_var, anchor="w")
+        status_bar.pack(side="bottom", fill="x")
+        persistence.report = self.report_saved
+        self.after(PERSISTENCE_POLL_MS, self.poll_persistence)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
         self.show_frame(Front)
     
     def show_frame(self, cont):
         frame = self.frames[cont]
+        if hasattr(frame, 'refresh'):
+            frame.refresh()
         frame.tkraise()
 
+    def poll_persistence(self):
+        persistence.dispatch_completed()
+        self.after(PERSISTENCE_POLL_MS, self.poll_persistence)
+
+    def report_saved(self, message, error):
+        if error is not None:
+            messagebox.showerror("Error", f"Could not save data: {error}")
+        elif message:
+            self.status_var.set(f"{message} {self.write_summary()}")
+
+    def write_summary(self):
+        parts = []
+        for name, store in (("Students", students), ("Courses", courses)):
+            stats = store.write_stats()
+            pending = ", changes pending" if stats['dirty'] else ""
+            parts.append(f"{name}: {stats['writes_performed']} written, {stats['writes_skipped']} skipped{pending}")
+        return f"({'; '.join(parts)})"
+
+    def close(self):
+        self.status_var.set("Saving changes...")
+        self.update_idletasks()
+        persistence.stop()
+        persistence.dispatch_completed()
+        self.destroy()
+
 
 if __name__ == "__main__":
     app = SampleApp()
@@ -1,13 +1,69 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+import hashlib
+import threading
+
+from flask import Flask, render_template, render_template_string, request, redirect, url_for, flash, jsonify, make_response, session
 from db_manager import db_manager   # Import your DB manager logic
 from student_manager import StudentManager
 from course_manager import CourseManager
+from website import DATABASE_ERRORS, MAX_PAGE_SIZE, PAGE_SIZE
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'
 
 student_manager = StudentManager(db_manager)
-course_manager = CourseManager(db_manager)
+course_manager = CourseManager(db_manager, student_cache=student_manager.cache)
+
+PAGE_CACHE_SIZE = 256
+
+class PageCache:
+    # Entries belong to one data version; the first lookup after a mutation drops them all.
+    def __init__(self, data_version, max_entries=PAGE_CACHE_SIZE):
+        self.data_version = data_version
+        self.max_entries = max_entries
+        self._version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        version = self.data_version.version
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            return self._entries.get(key)
+
+    def get_or_render(self, key, render):
+        version = self.data_version.version
+        entry = self.lookup(key)
+        if entry is not None:
+            return entry
+
+        body = render()
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        entry = (data, f"{version}-{hashlib.sha1(data).hexdigest()[:16]}")
+        with self._lock:
+            # A mutation during rendering makes this body stale for the new version, so it is not kept.
+            if self._version == version == self.data_version.version and len(self._entries) < self.max_entries:
+                self._entries[key] = entry
+        return entry
+
+page_cache = PageCache(db_manager.data_version)
+
+def cached_response(render, mimetype='text/html'):
+    # Pages carrying flashed messages are one-off, so they are neither cached nor validated.
+    if session.get('_flashes'):
+        response = make_response(render())
+        response.mimetype = mimetype
+        return response
+
+    last_modified = db_manager.data_version.last_modified
+    body, etag = page_cache.get_or_render(request.full_path, render)
+    response = make_response(body)
+    response.mimetype = mimetype
+    response.set_etag(etag)
+    response.last_modified = int(last_modified)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/')
 def index():
@@ -15,13 +71,11 @@ def index():
 
 @app.route('/students')
 def view_students():
-    students = student_manager.get_students()
-    return render_template('students.html', students=students)
+    return cached_response(lambda: render_template('students.html', students=student_manager.get_students()))
 
 @app.route('/courses')
 def view_courses():
-    courses = course_manager.get_courses()
-    return render_template('courses.html', courses=courses)
+    return cached_response(lambda: render_template('courses.html', courses=course_manager.get_courses()))
 
 # Add a student
 @app.route('/add_student', methods=['GET', 'POST'])
@@ -89,7 +143,14 @@ def edit_course(course_code):
             'course_code': request.form['course_code'],
             'course_name': request.form['course_name']
         }
-        course_manager.update_course(**course_data)
+        if course_data['course_code'].upper() != course_code.upper():
+            try:
+                course_manager.rename_course(course_code, course_data['course_code'], course_data['course_name'])
+            except (ValueError, *DATABASE_ERRORS) as e:
+                flash(f'Could not rename course: {e}')
+                return redirect(url_for('view_courses'))
+        else:
+            course_manager.update_course(**course_data)
         flash('Course updated successfully!')
         return redirect(url_for('view_courses'))
     return render_template('edit_course.html', course=course)
@@ -101,5 +162,118 @@ def delete_course(course_code):
     flash('Course deleted successfully!')
     return redirect(url_for('view_courses'))
 
+# The dashboard is small enough to keep inline rather than ship a template file for it.
+DASHBOARD_TEMPLATE = """<!doctype html>
+<title>Enrollment dashboard</title>
+<h1>Enrollment dashboard</h1>
+<p>Total students: {{ counts.total }}</p>
+{% for title, group in (('By course', counts.by_course), ('By level', counts.by_level), ('By gender', counts.by_gender)) %}
+<h2>{{ title }}</h2>
+<table>
+{% for key, count in group|dictsort %}  <tr><td>{{ key or 'No course' }}</td><td>{{ count }}</td></tr>
+{% endfor %}</table>
+{% endfor %}"""
+
+@app.route('/dashboard')
+def dashboard():
+    return cached_response(lambda: render_template_string(DASHBOARD_TEMPLATE, counts=student_manager.enrollment_counts().snapshot()))
+
+@app.route('/api/enrollment')
+def api_enrollment():
+    return cached_response(lambda: jsonify(student_manager.enrollment_counts().snapshot()).get_data(), mimetype='application/json')
+
+@app.route('/api/enrollment/check')
+def api_enrollment_check():
+    problems = student_manager.check_enrollment_counts()
+    return jsonify(ok=not problems, problems=problems)
+
+@app.route('/api/cache_stats')
+def cache_stats():
+    return jsonify(students=student_manager.cache.stats(), courses=course_manager.cache.stats())
+
+@app.route('/api/pool_stats')
+def pool_stats():
+    return jsonify(pool=db_manager.pool_metrics())
+
+def page_arguments(args):
+    limit = args.get('limit', PAGE_SIZE, type=int)
+    fields = args.get('fields')
+    return {
+        'after': args.get('after') or None,
+        'limit': max(1, min(limit, MAX_PAGE_SIZE)),
+        'fields': fields.split(',') if fields else None,
+    }
+
+def load_students_page(args):
+    return student_manager.get_students_page(
+        course_code=args.get('course') or None,
+        lvl=args.get('level') or None,
+        gender=args.get('gender') or None,
+        **page_arguments(args)
+    )
+
+def load_courses_page(args):
+    return course_manager.get_courses_page(**page_arguments(args))
+
+def render_page(load_page, args):
+    items, next_after = load_page(args)
+    return jsonify(items=items, next=next_after).get_data()
+
+@app.route('/api/students')
+def api_students():
+    try:
+        return cached_response(lambda: render_page(load_students_page, request.args), mimetype='application/json')
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+@app.route('/api/courses')
+def api_courses():
+    try:
+        return cached_response(lambda: render_page(load_courses_page, request.args), mimetype='application/json')
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+# Batch JSON endpoints: every request is one transaction and the response lists a result per row.
+def batch_response(results):
+    status = 200 if all(result['ok'] for result in results) else 207
+    return jsonify(results=results), status
+
+def student_rows(payload):
+    rows = []
+    for row in payload:
+        # Rows that are not objects are passed through for the manager to reject one by one.
+        if not isinstance(row, dict):
+            rows.append(row)
+            continue
+        row = dict(row)
+        if 'level' in row:
+            row['lvl'] = row.pop('level')
+        rows.append(row)
+    return rows
+
+@app.route('/api/students/batch', methods=['POST', 'PUT', 'DELETE'])
+def students_batch():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        return jsonify(error='Expected a JSON list'), 400
+    if request.method == 'POST':
+        results = student_manager.add_students_bulk(student_rows(payload))
+    elif request.method == 'PUT':
+        results = student_manager.update_students_bulk(student_rows(payload))
+    else:
+        results = student_manager.delete_students_bulk([str(id_number) for id_number in payload])
+    return batch_response(results)
+
+@app.route('/api/courses/batch', methods=['POST', 'DELETE'])
+def courses_batch():
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        return jsonify(error='Expected a JSON list'), 400
+    if request.method == 'POST':
+        results = course_manager.add_courses_bulk(payload)
+    else:
+        results = course_manager.delete_courses_bulk([str(course_code) for course_code in payload])
+    return batch_response(results)
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,99 @@
+import email.utils
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import jsonify
+from werkzeug.datastructures import MultiDict
+
+from app import app, db_manager, load_courses_page, load_students_page, page_cache, render_page
+from website import AsyncDatabaseManager
+
+async_db = AsyncDatabaseManager(db_manager)
+wsgi_app = WsgiToAsgi(app)
+
+# Read-only JSON pages are served natively; every other route goes through the Flask app unchanged.
+ASYNC_ROUTES = {
+    '/api/students': load_students_page,
+    '/api/courses': load_courses_page,
+}
+
+
+def render_in_app(load_page, args):
+    with app.app_context():
+        return render_page(load_page, args)
+
+
+def not_modified(headers, etag, last_modified):
+    if_none_match = headers.get(b'if-none-match')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.decode('latin-1').split(',')]
+        return '*' in tags or f'"{etag}"' in tags
+    if_modified_since = headers.get(b'if-modified-since')
+    if if_modified_since is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since.decode('latin-1')).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+async def send_response(send, status, body, headers=(), head=False):
+    await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-length', str(len(body)).encode())] + list(headers)})
+    await send({'type': 'http.response.body', 'body': b'' if head else body})
+
+
+async def serve_page(scope, send, load_page):
+    query_string = scope['query_string'].decode('latin-1')
+    args = MultiDict(parse_qsl(query_string, keep_blank_values=True))
+    # Same cache key as Flask's request.full_path, so both servers share rendered pages.
+    key = f"{scope['path']}?{query_string}"
+    last_modified = db_manager.data_version.last_modified
+    entry = page_cache.lookup(key)
+    if entry is None:
+        try:
+            entry = await async_db.run(page_cache.get_or_render, key, lambda: render_in_app(load_page, args))
+        except ValueError as e:
+            with app.app_context():
+                body = jsonify(error=str(e)).get_data()
+            await send_response(send, 400, body, [(b'content-type', b'application/json')])
+            return
+
+    body, etag = entry
+    head = scope['method'] == 'HEAD'
+    headers = [
+        (b'etag', f'"{etag}"'.encode()),
+        (b'last-modified', email.utils.formatdate(int(last_modified), usegmt=True).encode()),
+        (b'cache-control', b'no-cache'),
+    ]
+    if not_modified(dict(scope['headers']), etag, last_modified):
+        await send_response(send, 304, b'', headers)
+        return
+    await send_response(send, 200, body, headers + [(b'content-type', b'application/json')], head)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            async_db.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def asgi_app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    load_page = ASYNC_ROUTES.get(scope['path'])
+    if load_page is not None and scope['method'] in ('GET', 'HEAD'):
+        await serve_page(scope, send, load_page)
+    else:
+        await wsgi_app(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(asgi_app, host='127.0.0.1', port=8000)
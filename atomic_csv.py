@@ -0,0 +1,45 @@
+import csv
+import os
+import tempfile
+from itertools import islice
+
+SNAPSHOT_BATCH_SIZE = 5000
+SNAPSHOT_BUFFER_SIZE = 1 << 20
+
+
+def write_csv_atomically(path, fieldnames, rows):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        os.chmod(temp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        with open(fd, mode='w', newline='', buffering=SNAPSHOT_BUFFER_SIZE) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, SNAPSHOT_BATCH_SIZE))
+                if not batch:
+                    break
+                writer.writerows(batch)
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+        # Readers see either the complete old snapshot or the complete new one, never a partial file.
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,115 @@
+"""Requests/sec and tail latency of /api/students under the Flask dev server and the ASGI app.
+
+Each server runs in its own process over a pooled SQLite stand-in, started by this script with --serve.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import COURSE_CODES, install_app_modules, latency_database, percentile, seed_database, unique_student_rows
+
+
+def serve(kind, path, pool_size, port):
+    db_manager = latency_database(path, pool_size=pool_size)
+    db_manager.connect()
+    install_app_modules(db_manager)
+    if kind == 'sync':
+        from app import app
+        app.run(port=port, threaded=True)
+    else:
+        import uvicorn
+        from asgi import asgi_app
+        uvicorn.run(asgi_app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def fetch(port, target):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.startswith(b'HTTP/1.1 200') or response.startswith(b'HTTP/1.0 200')
+
+
+async def load(port, clients, duration, ids):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(seed):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            # Random filtered pages, so most requests miss the page cache.
+            target = f"/api/students?course={rng.choice(COURSE_CODES)}&level={rng.randint(1, 6)}&after={rng.choice(ids)}"
+            start = time.perf_counter()
+            try:
+                ok = await fetch(port, target)
+            except OSError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(client(seed) for seed in range(clients)))
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--pool-size', type=int, default=8)
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 200, 500])
+    parser.add_argument('--duration', type=float, default=8.0)
+    parser.add_argument('--port', type=int, default=8151)
+    parser.add_argument('--serve', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.db, args.pool_size, args.port)
+        return
+
+    path = os.path.join(tempfile.mkdtemp(), 'students.db')
+    seed_database(path, args.rows)
+    ids = [row[0] for row in unique_student_rows(args.rows)]
+
+    print(f"{'server':<8} {'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7}")
+    for kind in ('sync', 'async'):
+        for clients in args.clients:
+            server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', kind, '--db', path,
+                                       '--pool-size', str(args.pool_size), '--port', str(args.port)],
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_for_port(args.port)
+                latencies, errors = asyncio.run(load(args.port, clients, args.duration, ids))
+            finally:
+                server.terminate()
+                server.wait()
+            if latencies:
+                print(f"{kind:<8} {clients:>8} {len(latencies) / args.duration:>8.0f} {percentile(latencies, 0.5) * 1000:>8.0f} "
+                      f"{percentile(latencies, 0.99) * 1000:>9.0f} {errors:>7}")
+            else:
+                print(f"{kind:<8} {clients:>8} {'no successful requests':>34} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
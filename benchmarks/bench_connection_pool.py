@@ -0,0 +1,61 @@
+"""Throughput and latency of concurrent keyed lookups with one shared connection and with pooled connections."""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from common import latency_database, percentile, seed_database, unique_student_rows
+
+
+def run_clients(db_manager, ids, threads, duration):
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        samples = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            db_manager.execute_query("SELECT * FROM students WHERE id = %s", (rng.choice(ids),), raise_errors=True)
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(samples)
+
+    workers = [threading.Thread(target=client, args=(seed,)) for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[0, 4, 16], help="0 is the unpooled single connection")
+    parser.add_argument('--latency-ms', type=float, default=2.0, help="simulated round trip per statement")
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'students.db')
+    seed_database(path, args.rows)
+    ids = [row[0] for row in unique_student_rows(args.rows)]
+
+    print(f"{'mode':<20} {'queries/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'waits':>8}")
+    for pool_size in args.pool_sizes:
+        db_manager = latency_database(path, args.latency_ms / 1000, pool_size or None)
+        db_manager.connect()
+        latencies = run_clients(db_manager, ids, args.threads, args.duration)
+        metrics = db_manager.pool_metrics()
+        db_manager.close_connection()
+        mode = f"pool_size={pool_size}" if pool_size else "single connection"
+        print(f"{mode:<20} {len(latencies) / args.duration:>10.0f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.1f} {metrics['waits'] if metrics else '-':>8}")
+
+
+if __name__ == '__main__':
+    main()
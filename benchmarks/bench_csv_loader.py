@@ -0,0 +1,52 @@
+"""Throughput of the validating students.csv loader against the previous DictReader loader."""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from common import load_project, student_rows
+
+
+def dictreader_load(project, path):
+    # The loader as it was before validation: one DictReader pass and an all() check per row.
+    students = []
+    with open(path, mode='r') as csvfile:
+        for row in csv.DictReader(csvfile):
+            if all(field in row for field in ['id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code']):
+                students.append(project.Student(row['id'], row['first_name'], row['middle_name'], row['last_name'], row['lvl'], row['gender'], row['course_code']))
+    return students
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    project = load_project()
+    path = os.path.join(tempfile.mkdtemp(), 'students.csv')
+    with open(path, mode='w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(project.STUDENT_FIELDS)
+        writer.writerows(student_rows(args.rows))
+
+    errors = []
+    start = time.perf_counter()
+    rows = project.iter_students_from_csv(path, errors)
+    next(rows)
+    first_row = time.perf_counter() - start
+    loaded = 1 + sum(1 for _ in rows)
+    streaming = time.perf_counter() - start
+
+    start = time.perf_counter()
+    previous = len(dictreader_load(project, path))
+    dictreader = time.perf_counter() - start
+
+    print(f"{'loader':<28} {'rows':>9} {'seconds':>9} {'rows/s':>10}")
+    print(f"{'iter_students_from_csv':<28} {loaded:>9} {streaming:>9.2f} {loaded / streaming:>10.0f}")
+    print(f"{'previous DictReader loader':<28} {previous:>9} {dictreader:>9.2f} {previous / dictreader:>10.0f}")
+    print(f"\nfirst validated row after {first_row * 1000:.2f} ms; {len(errors)} rows rejected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Latency of keyset-paginated student pages as the table grows, against fetching the whole table."""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from common import COURSE_CODES, percentile, seed_database, unique_student_rows
+from website import DatabaseManager, StudentManager
+
+FILTERS = {
+    'unfiltered': lambda rng: {},
+    'course': lambda rng: {'course_code': rng.choice(COURSE_CODES)},
+    'course+level+gender': lambda rng: {'course_code': rng.choice(COURSE_CODES), 'lvl': rng.randint(1, 6), 'gender': rng.choice('MF')},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--pages', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(151)
+    directory = tempfile.mkdtemp()
+    print(f"{'rows':>10} " + ' '.join(f"{name + ' p50/p99 ms':>32}" for name in FILTERS) + f" {'full table ms':>14}")
+    for size in args.sizes:
+        path = os.path.join(directory, f'students_{size}.db')
+        seed_database(path, size)
+        ids = [row[0] for row in unique_student_rows(size)]
+        db_manager = DatabaseManager.sqlite(path)
+        db_manager.connect()
+        student_manager = StudentManager(db_manager)
+
+        cells = []
+        for make_filters in FILTERS.values():
+            latencies = []
+            for _ in range(args.pages):
+                # Each page starts at a random cursor, as a client deep into a listing would.
+                filters = make_filters(rng)
+                start = time.perf_counter()
+                student_manager.get_students_page(after=rng.choice(ids), **filters)
+                latencies.append(time.perf_counter() - start)
+            cells.append(f"{percentile(latencies, 0.5) * 1000:.2f}/{percentile(latencies, 0.99) * 1000:.2f}")
+
+        start = time.perf_counter()
+        db_manager.get_students()
+        full_table = time.perf_counter() - start
+        db_manager.close_connection()
+        print(f"{size:>10} " + ' '.join(f"{cell:>32}" for cell in cells) + f" {full_table * 1000:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
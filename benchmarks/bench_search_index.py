@@ -0,0 +1,37 @@
+"""Build time, memory and query time of the student search index."""
+import argparse
+import time
+
+from common import load_project, measure, report, student_rows
+
+QUERIES = ('cruz', 'an', 'bscs', 'maria santos', '2019-', 'zzz')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    project = load_project()
+    rows = list(student_rows(args.rows))
+    results = []
+    students = measure(f"load {args.rows} students", results, lambda: None,
+                       lambda _: project.StudentStore(project.Student(*row) for row in rows))
+    measure("build index (first search)", results, lambda: project.StudentStore(students), lambda store: store.search('cruz'))
+    # The index built above was on a copy; build it on the store the queries below use.
+    students.search('cruz')
+    report(results)
+
+    print(f"\n{'query':<16} {'matches':>8} {'ms/query':>10}")
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            # A fresh query each time, so the incremental narrowing cache is not measured.
+            students.search_index.search('')
+            matches = students.search(query)
+        print(f"{query:<16} {len(matches):>8} {(time.perf_counter() - start) / args.repeat * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
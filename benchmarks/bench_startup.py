@@ -0,0 +1,71 @@
+"""Startup critical path of website.py's Front, eager against lazy, without a display.
+
+Eager mode blocks the window on connect, the schema step and both table fetches. Lazy mode shows the
+window first and does the same work on a background thread; the time until the first tab's rows
+arrive is reported alongside. The fetches are Front's own, called without building any widgets.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+import types
+
+from common import latency_database, seed_database
+from website import Front
+
+
+def eager(path, latency):
+    start = time.perf_counter()
+    db_manager = latency_database(path, latency)
+    front = types.SimpleNamespace(db_manager=db_manager)
+    db_manager.connect()
+    db_manager.ensure_schema()
+    Front.fetch_students(front)
+    Front.fetch_courses(front)
+    blocked = time.perf_counter() - start
+    db_manager.close_connection()
+    return blocked, blocked
+
+
+def lazy(path, latency):
+    start = time.perf_counter()
+    db_manager = latency_database(path, latency)
+    front = types.SimpleNamespace(db_manager=db_manager)
+    loaded = []
+
+    def connect_and_load():
+        db_manager.connect()
+        db_manager.ensure_schema()
+        Front.fetch_students(front)
+        loaded.append(time.perf_counter() - start)
+
+    worker = threading.Thread(target=connect_and_load)
+    worker.start()
+    blocked = time.perf_counter() - start
+    worker.join()
+    db_manager.close_connection()
+    return blocked, loaded[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="simulated round trip per statement")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'students.db')
+    seed_database(path, args.rows)
+
+    print(f"{'mode':<8} {'window blocked ms':>18} {'first tab rows ms':>18}")
+    for label, start_up in (('eager', eager), ('lazy', lazy)):
+        runs = [start_up(path, args.latency_ms / 1000) for _ in range(args.repeat)]
+        blocked = statistics.median(run[0] for run in runs)
+        first_rows = statistics.median(run[1] for run in runs)
+        print(f"{label:<8} {blocked * 1000:>18.1f} {first_rows * 1000:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
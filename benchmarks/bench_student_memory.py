@@ -0,0 +1,51 @@
+"""Memory held by a roster of Student records: the slotted, interned classes against the previous plain class."""
+import argparse
+import csv
+
+from common import load_project, measure, report, student_rows
+
+
+class PlainStudent:
+    # The Student class as it was before __slots__ and interning.
+    def __init__(self, id, first_name, middle_name, last_name, lvl, gender, course_code):
+        self.id = id
+        self.first_name = first_name
+        self.middle_name = middle_name
+        self.last_name = last_name
+        self.lvl = lvl
+        self.gender = gender
+        self.course_code = course_code
+
+
+def csv_lines(count, genders):
+    for row in student_rows(count):
+        yield ','.join(row[:5] + (genders.get(row[5], row[5]),) + row[6:])
+
+
+def build(student_class, count, genders):
+    # Parsing each line gives every row its own strings, as loading students.csv does.
+    return [student_class(*row) for row in csv.reader(csv_lines(count, genders))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    project = load_project()
+    classes = [('previous plain class', PlainStudent, {}), ('CSC 151 Project.Student', project.Student, {})]
+    try:
+        import website
+        # website.Student validates the form's gender labels rather than the stored codes.
+        classes.append(('website.Student', website.Student, {code: label for label, code in website.GENDER_VALUES.items()}))
+    except ImportError:
+        print("website.py needs mysql-connector-python; skipping its Student class")
+
+    results = []
+    for label, student_class, genders in classes:
+        measure(f"{label}, {args.rows} rows", results, lambda: None, lambda _: build(student_class, args.rows, genders))
+    report(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Per-operation cost of ID lookup, delete and re-add on StudentStore against a linear scan of a list."""
+import argparse
+import random
+import time
+
+from common import load_project, unique_student_rows
+
+
+def store_step(store, id_number):
+    if id_number in store:
+        student = store.remove(id_number)
+        store.add(student)
+
+
+def list_step(students, id_number):
+    # What add_student/delete_student did before the index: any() for the duplicate check, then list.remove.
+    if any(student.id == id_number for student in students):
+        student = next(student for student in students if student.id == id_number)
+        students.remove(student)
+        students.append(student)
+
+
+def time_ops(step, target, ids):
+    start = time.perf_counter()
+    for id_number in ids:
+        step(target, id_number)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    parser.add_argument('--ops', type=int, default=1000)
+    parser.add_argument('--scan-ops', type=int, default=20, help="operations for the linear scan, which is slow on large rosters")
+    args = parser.parse_args()
+
+    project = load_project()
+    rng = random.Random(151)
+    print(f"{'students':>10} {'store us/op':>12} {'list scan us/op':>16}")
+    for size in args.sizes:
+        students = [project.Student(*row) for row in unique_student_rows(size)]
+        ids = [rng.choice(students).id for _ in range(args.ops)]
+        store = project.StudentStore(students)
+        store_us = time_ops(store_step, store, ids)
+        scan_us = time_ops(list_step, students, ids[:args.scan_ops])
+        print(f"{size:>10} {store_us:>12.2f} {scan_us:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
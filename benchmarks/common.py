@@ -0,0 +1,119 @@
+import importlib.util
+import os
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIRST_NAMES = ['JUAN', 'MARIA', 'JOSE', 'ANA', 'LUKE', 'EMMA', 'OLIVIA', 'LIAM', 'HARPER', 'LAYLA', 'NOAH', 'AURORA']
+LAST_NAMES = ['CRUZ', 'SANTOS', 'REYES', 'GARCIA', 'NELSON', 'WARD', 'RIVERA', 'BROWN', 'LOPEZ', 'JONES']
+COURSE_CODES = ['BSCS', 'BSIT', 'BSIS', 'BSCE', 'BSN', 'BSME', 'BSEE', 'BSA']
+
+
+def load_project():
+    # The Tk app lives in a file whose name is not importable, so it is loaded by path.
+    spec = importlib.util.spec_from_file_location('csc151_project', os.path.join(ROOT, 'CSC 151 Project.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def student_rows(count, seed=151):
+    rng = random.Random(seed)
+    for number in range(count):
+        # IDs repeat after 100,000 rows, which the store allows.
+        yield (f'{2015 + number // 10000 % 10}-{number % 10000:04d}', rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(LAST_NAMES),
+               str(rng.randint(1, 6)), rng.choice('MF'), rng.choice(COURSE_CODES))
+
+
+def unique_student_rows(count, seed=151):
+    # IDs are unique up to 10 million rows, for benchmarks that insert into a table keyed on id.
+    rng = random.Random(seed)
+    for number in range(count):
+        yield (f'{2000 + number // 10000 % 1000:04d}-{number % 10000:04d}', rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), rng.choice(LAST_NAMES),
+               str(rng.randint(1, 6)), rng.choice('MF'), rng.choice(COURSE_CODES))
+
+
+class LatencyCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        time.sleep(self.connection.latency)
+        return super().execute(*args)
+
+    def executemany(self, *args):
+        time.sleep(self.connection.latency)
+        return super().executemany(*args)
+
+
+class LatencyConnection(sqlite3.Connection):
+    # Sleeps before every statement to stand in for the network round trip to a MySQL server.
+    latency = 0.0
+
+    def cursor(self, factory=LatencyCursor):
+        return super().cursor(factory)
+
+
+def seed_database(path, count, seed=151):
+    from migrations import migrate
+    from website import DatabaseManager
+
+    if os.path.exists(path):
+        os.remove(path)
+    db_manager = DatabaseManager.sqlite(path)
+    db_manager.connect()
+    migrate(db_manager)
+    db_manager.execute_many("INSERT INTO courses (course_code, course_name) VALUES (%s, %s)", [(code, f'Course {code}') for code in COURSE_CODES])
+    db_manager.execute_many("INSERT INTO students (id, first_name, middle_name, last_name, lvl, gender, course_code) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                            list(unique_student_rows(count, seed)))
+    db_manager.close_connection()
+
+
+def latency_database(path, latency=0.0, pool_size=None):
+    from website import DatabaseManager
+
+    def connect():
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, factory=LatencyConnection)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.latency = latency
+        return connection
+
+    return DatabaseManager(None, None, None, path, connection_factory=connect, dialect='sqlite', pool_size=pool_size)
+
+
+def install_app_modules(db_manager):
+    # app.py imports its database manager from modules each deployment provides; these stand in for them.
+    import website
+    sys.modules['db_manager'] = types.SimpleNamespace(db_manager=db_manager)
+    sys.modules['student_manager'] = types.SimpleNamespace(StudentManager=website.StudentManager)
+    sys.modules['course_manager'] = types.SimpleNamespace(CourseManager=website.CourseManager)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(label, results, setup, step):
+    # tracemalloc slows allocation-heavy code several times over, so time and memory come from separate runs.
+    target = setup()
+    start = time.perf_counter()
+    step(target)
+    elapsed = time.perf_counter() - start
+
+    target = setup()
+    tracemalloc.start()
+    value = step(target)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results.append((label, elapsed, current, peak))
+    return value
+
+
+def report(results):
+    print(f"{'step':<40} {'seconds':>10} {'held MB':>10} {'peak MB':>10}")
+    for label, elapsed, current, peak in results:
+        print(f"{label:<40} {elapsed:>10.4f} {current / 2**20:>10.1f} {peak / 2**20:>10.1f}")
@@ -0,0 +1,120 @@
+import argparse
+import csv
+import time
+
+from atomic_csv import write_csv_atomically
+from migrations import migrate
+from website import DATABASE_ERRORS, DatabaseManager, db_host, db_name, db_password, db_username
+
+BATCH_SIZE = 5000
+TABLES = {
+    'courses': ('courses.csv', ('course_code', 'course_name'), 'course_code'),
+    'students': ('students.csv', ('id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code'), 'id'),
+}
+
+
+def upsert_query(db_manager, table):
+    _, columns, key = TABLES[table]
+    placeholders = ', '.join(['%s'] * len(columns))
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    updates = [column for column in columns if column != key]
+    if db_manager.dialect == 'sqlite':
+        return query + f" ON CONFLICT({key}) DO UPDATE SET " + ', '.join(f"{column} = excluded.{column}" for column in updates)
+    return query + " ON DUPLICATE KEY UPDATE " + ', '.join(f"{column} = VALUES({column})" for column in updates)
+
+
+def report(action, table, rows, elapsed):
+    rate = rows / elapsed if elapsed > 0 else float(rows)
+    print(f"{action} {rows} {table} rows in {elapsed:.2f}s ({rate:.0f} rows/sec)")
+
+
+def import_csv(db_manager, table, path=None, batch_size=BATCH_SIZE):
+    default_path, columns, _ = TABLES[table]
+    path = path or default_path
+    query = upsert_query(db_manager, table)
+    start = time.perf_counter()
+    imported = 0
+    batch = []
+
+    def flush(line_number):
+        nonlocal imported
+        try:
+            db_manager.execute_many(query, batch)
+        except DATABASE_ERRORS as e:
+            print(f"Error importing {path} rows {line_number - len(batch) + 1}-{line_number}: {e}")
+            raise
+        imported += len(batch)
+        batch.clear()
+
+    line_number = 1
+    with open(path, mode='r', newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for line_number, row in enumerate(reader, start=2):
+            # Empty course codes are stored as NULL, which is what deleting a course leaves behind.
+            batch.append(tuple((row.get(column) or '').strip() or None for column in columns))
+            if len(batch) >= batch_size:
+                flush(line_number)
+    if batch:
+        flush(line_number)
+
+    report("Imported", table, imported, time.perf_counter() - start)
+    return imported
+
+
+def export_csv(db_manager, table, path=None, batch_size=BATCH_SIZE):
+    default_path, columns, key = TABLES[table]
+    path = path or default_path
+    query = f"SELECT {', '.join(columns)} FROM {table} ORDER BY {key}"
+    start = time.perf_counter()
+    exported = 0
+
+    def rows():
+        nonlocal exported
+        for row in db_manager.iter_query(query, batch_size=batch_size):
+            exported += 1
+            yield ['' if value is None else value for value in row]
+
+    # The same temp file, fsync and rename as the CSV app, so the app never reads a half-written export.
+    write_csv_atomically(path, columns, rows())
+
+    report("Exported", table, exported, time.perf_counter() - start)
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copy students and courses between the CSV files and the database.")
+    parser.add_argument('action', choices=('import', 'export'))
+    parser.add_argument('--table', choices=tuple(TABLES), help="Only copy this table (default: courses, then students).")
+    parser.add_argument('--file', help="CSV file to read or write (default: <table>.csv).")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--sqlite', help="Use this SQLite file instead of the MySQL database.")
+    args = parser.parse_args()
+
+    if args.file and not args.table:
+        parser.error("--file requires --table")
+
+    if args.sqlite:
+        db_manager = DatabaseManager.sqlite(args.sqlite)
+    else:
+        db_manager = DatabaseManager(db_host, db_username, db_password, db_name)
+    db_manager.connect()
+    if not db_manager.connection and not db_manager.pool:
+        raise SystemExit(1)
+
+    # Courses go first on import so student course codes satisfy the foreign key.
+    tables = [args.table] if args.table else list(TABLES)
+    try:
+        migrate(db_manager)
+        for table in tables:
+            if args.action == 'import':
+                import_csv(db_manager, table, args.file, args.batch_size)
+            else:
+                export_csv(db_manager, table, args.file, args.batch_size)
+    except DATABASE_ERRORS as e:
+        raise SystemExit(f"Database error: {e}")
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == '__main__':
+    main()
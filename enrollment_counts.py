@@ -0,0 +1,83 @@
+import threading
+from collections import Counter
+
+
+class EnrollmentCounts:
+    def __init__(self, rows=()):
+        self.total = 0
+        self.by_course = Counter()
+        self.by_level = Counter()
+        self.by_gender = Counter()
+        self._lock = threading.Lock()
+        for course_code, lvl, gender, count in rows:
+            self.add(course_code, lvl, gender, count)
+
+    def add(self, course_code, lvl, gender, count=1):
+        with self._lock:
+            self._change(course_code, lvl, gender, count)
+
+    def remove(self, course_code, lvl, gender, count=1):
+        with self._lock:
+            self._change(course_code, lvl, gender, -count)
+
+    def replace(self, old, new):
+        # old and new are (course_code, lvl, gender) tuples for the same student.
+        with self._lock:
+            self._change(*old, -1)
+            self._change(*new, 1)
+
+    def move_course(self, old_code, new_code, count):
+        if not count:
+            return
+        with self._lock:
+            self._bump(self.by_course, course_key(old_code), -count)
+            self._bump(self.by_course, course_key(new_code), count)
+
+    def _change(self, course_code, lvl, gender, delta):
+        self.total += delta
+        self._bump(self.by_course, course_key(course_code), delta)
+        self._bump(self.by_level, str(lvl), delta)
+        self._bump(self.by_gender, gender, delta)
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        # Zero counts are dropped so a snapshot compares equal to a fresh recount.
+        value = counter[key] + delta
+        if value:
+            counter[key] = value
+        else:
+            del counter[key]
+
+    def course_count(self, course_code):
+        return self.by_course.get(course_key(course_code), 0)
+
+    def level_count(self, lvl):
+        return self.by_level.get(str(lvl), 0)
+
+    def gender_count(self, gender):
+        return self.by_gender.get(gender, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'total': self.total,
+                'by_course': dict(self.by_course),
+                'by_level': dict(self.by_level),
+                'by_gender': dict(self.by_gender),
+            }
+
+    def differences(self, other):
+        mine, theirs = self.snapshot(), other.snapshot()
+        problems = []
+        if mine['total'] != theirs['total']:
+            problems.append(f"total: {mine['total']} != {theirs['total']}")
+        for group in ('by_course', 'by_level', 'by_gender'):
+            for key in sorted(set(mine[group]) | set(theirs[group])):
+                if mine[group].get(key, 0) != theirs[group].get(key, 0):
+                    problems.append(f"{group}[{key}]: {mine[group].get(key, 0)} != {theirs[group].get(key, 0)}")
+        return problems
+
+
+def course_key(course_code):
+    # Students left without a course after a delete are counted under ''.
+    return course_code or ''
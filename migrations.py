@@ -0,0 +1,213 @@
+import argparse
+import sqlite3
+
+import mysql.connector
+
+SEARCH_INDEXES = {
+    'idx_students_name': ('students', '(last_name, first_name, middle_name)'),
+    'idx_students_course_page': ('students', '(course_code, id)'),
+    'idx_courses_name': ('courses', '(course_name)'),
+}
+
+# MySQL keyword search runs MATCH ... AGAINST over these; SQLite has no FULLTEXT and keeps using LIKE.
+FULLTEXT_INDEXES = {
+    'students': ('ft_students_search', ('id', 'first_name', 'middle_name', 'last_name', 'course_code')),
+    'courses': ('ft_courses_search', ('course_code', 'course_name')),
+}
+
+MYSQL_NO_SUCH_TABLE = 1146
+
+SCHEMA_VERSION_TABLE = "CREATE TABLE IF NOT EXISTS schema_version (version INT PRIMARY KEY, description VARCHAR(200) NOT NULL, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+
+COURSES_TABLE = "CREATE TABLE IF NOT EXISTS courses (course_code VARCHAR(20) PRIMARY KEY, course_name VARCHAR(100) NOT NULL)"
+
+STUDENTS_TABLE = {
+    'mysql': """CREATE TABLE IF NOT EXISTS students (
+        id VARCHAR(9) PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        middle_name VARCHAR(50),
+        last_name VARCHAR(50) NOT NULL,
+        lvl INT NOT NULL,
+        gender ENUM('M', 'F', 'O') NOT NULL,
+        course_code VARCHAR(20)
+    )""",
+    # SQLite cannot add a constraint to an existing table, so the foreign key is declared up front.
+    'sqlite': """CREATE TABLE IF NOT EXISTS students (
+        id VARCHAR(9) PRIMARY KEY,
+        first_name VARCHAR(50) NOT NULL,
+        middle_name VARCHAR(50),
+        last_name VARCHAR(50) NOT NULL,
+        lvl INTEGER NOT NULL,
+        gender TEXT NOT NULL CHECK (gender IN ('M', 'F', 'O')),
+        course_code VARCHAR(20),
+        CONSTRAINT fk_course_code FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL
+    )""",
+}
+
+SQLITE_CASCADE_STUDENTS_TABLE = """CREATE TABLE students_cascade (
+    id VARCHAR(9) PRIMARY KEY,
+    first_name VARCHAR(50) NOT NULL,
+    middle_name VARCHAR(50),
+    last_name VARCHAR(50) NOT NULL,
+    lvl INTEGER NOT NULL,
+    gender TEXT NOT NULL CHECK (gender IN ('M', 'F', 'O')),
+    course_code VARCHAR(20),
+    CONSTRAINT fk_course_code FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL ON UPDATE CASCADE
+)"""
+STUDENT_COLUMNS = "id, first_name, middle_name, last_name, lvl, gender, course_code"
+
+# Queries the indexes exist for; `python migrations.py --explain` prints how the database runs them.
+INDEX_CHECKS = (
+    ("student by id", "SELECT * FROM students WHERE id = %s", ('2020-0001',)),
+    ("students in course", "SELECT * FROM students WHERE course_code = %s", ('BSCS',)),
+    ("course page", "SELECT id FROM students WHERE course_code = %s AND id > %s ORDER BY id LIMIT 50", ('BSCS', '2020-0001')),
+    ("students by name", "SELECT * FROM students WHERE last_name = %s AND first_name = %s", ('Cruz', 'Juan')),
+    ("courses by name", "SELECT * FROM courses WHERE course_name = %s", ('Computer Science',)),
+    ("schema version", "SELECT MAX(version) FROM schema_version", ()),
+)
+
+
+def create_tables(db_manager):
+    db_manager.execute_query(COURSES_TABLE, raise_errors=True)
+    db_manager.execute_query(STUDENTS_TABLE[db_manager.dialect], raise_errors=True)
+
+
+def add_course_foreign_key(db_manager):
+    if db_manager.dialect != 'mysql':
+        return
+    query = "SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS WHERE CONSTRAINT_NAME = 'fk_course_code' AND CONSTRAINT_SCHEMA = %s"
+    rows = db_manager.execute_query(query, (db_manager.database,), raise_errors=True)
+    if rows and rows[0][0] > 0:
+        return
+    db_manager.execute_query("ALTER TABLE students ADD CONSTRAINT fk_course_code FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL", raise_errors=True)
+
+
+def add_search_indexes(db_manager):
+    for index_name, (table, columns) in SEARCH_INDEXES.items():
+        if not db_manager.index_exists(table, index_name):
+            db_manager.execute_query(f"CREATE INDEX {index_name} ON {table} {columns}", raise_errors=True)
+
+
+def cascade_course_renames(db_manager):
+    # Students left pointing at a missing course by the old FOREIGN_KEY_CHECKS toggle would block the new constraint.
+    db_manager.execute_query("UPDATE students SET course_code = NULL WHERE course_code IS NOT NULL AND course_code NOT IN (SELECT course_code FROM courses)", raise_errors=True)
+
+    if db_manager.dialect == 'mysql':
+        query = "SELECT UPDATE_RULE FROM information_schema.REFERENTIAL_CONSTRAINTS WHERE CONSTRAINT_SCHEMA = %s AND CONSTRAINT_NAME = 'fk_course_code'"
+        rows = db_manager.execute_query(query, (db_manager.database,), raise_errors=True)
+        if rows and rows[0][0] == 'CASCADE':
+            return
+        # MySQL rejects dropping and re-adding a constraint of the same name in one ALTER TABLE.
+        if rows:
+            db_manager.execute_query("ALTER TABLE students DROP FOREIGN KEY fk_course_code", raise_errors=True)
+        db_manager.execute_query("ALTER TABLE students ADD CONSTRAINT fk_course_code FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL ON UPDATE CASCADE", raise_errors=True)
+        return
+
+    # SQLite cannot alter a constraint, so the table is rebuilt with it and its indexes recreated.
+    foreign_keys = db_manager.execute_query("PRAGMA foreign_key_list(students)", raise_errors=True)
+    if any(row[2] == 'courses' and row[5] == 'CASCADE' for row in foreign_keys):
+        return
+    with db_manager.transaction(immediate=True) as cursor:
+        cursor.execute(SQLITE_CASCADE_STUDENTS_TABLE)
+        cursor.execute(f"INSERT INTO students_cascade ({STUDENT_COLUMNS}) SELECT {STUDENT_COLUMNS} FROM students")
+        cursor.execute("DROP TABLE students")
+        cursor.execute("ALTER TABLE students_cascade RENAME TO students")
+    add_search_indexes(db_manager)
+
+
+def add_fulltext_indexes(db_manager):
+    if db_manager.dialect != 'mysql':
+        return
+    for table, (index_name, columns) in FULLTEXT_INDEXES.items():
+        if not db_manager.index_exists(table, index_name):
+            db_manager.execute_query(f"CREATE FULLTEXT INDEX {index_name} ON {table} ({', '.join(columns)})", raise_errors=True)
+
+
+def drop_course_code_index(db_manager):
+    # idx_students_course_page leads with course_code, so it already serves every lookup this index did.
+    if not db_manager.index_exists('students', 'idx_students_course_code'):
+        return
+    if db_manager.dialect == 'mysql':
+        db_manager.execute_query("DROP INDEX idx_students_course_code ON students", raise_errors=True)
+    else:
+        db_manager.execute_query("DROP INDEX idx_students_course_code", raise_errors=True)
+
+
+# Append new steps with the next version number; applied steps must never change.
+MIGRATIONS = (
+    (1, "Create courses and students tables", create_tables),
+    (2, "Add the students.course_code foreign key", add_course_foreign_key),
+    (3, "Add course and name search indexes", add_search_indexes),
+    (4, "Cascade course code renames to students", cascade_course_renames),
+    (5, "Add FULLTEXT keyword search indexes", add_fulltext_indexes),
+    (6, "Drop the students.course_code index covered by the course page index", drop_course_code_index),
+)
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(db_manager):
+    # A missing schema_version table means nothing has been applied by this runner; any other error is real.
+    try:
+        rows = db_manager.execute_query("SELECT MAX(version) FROM schema_version", raise_errors=True)
+    except mysql.connector.Error as e:
+        if e.errno != MYSQL_NO_SUCH_TABLE:
+            raise
+        return 0
+    except sqlite3.OperationalError as e:
+        if not str(e).startswith('no such table'):
+            raise
+        return 0
+    return (rows[0][0] or 0) if rows else 0
+
+
+def migrate(db_manager, target=LATEST_VERSION):
+    # Startup only pays for the MAX(version) primary-key lookup once the schema is current.
+    version = current_version(db_manager)
+    if version >= target:
+        return []
+
+    db_manager.execute_query(SCHEMA_VERSION_TABLE, raise_errors=True)
+    applied = []
+    for number, description, step in MIGRATIONS:
+        if number <= version or number > target:
+            continue
+        step(db_manager)
+        db_manager.execute_query("INSERT INTO schema_version (version, description) VALUES (%s, %s)", (number, description), raise_errors=True)
+        print(f"Applied migration {number}: {description}")
+        applied.append(number)
+    return applied
+
+
+def explain(db_manager, query, params=()):
+    prefix = "EXPLAIN QUERY PLAN " if db_manager.dialect == 'sqlite' else "EXPLAIN "
+    return db_manager.execute_query(prefix + query, params or None, raise_errors=True)
+
+
+def main():
+    from website import DatabaseManager, db_host, db_name, db_password, db_username
+
+    parser = argparse.ArgumentParser(description="Bring the students database schema up to date.")
+    parser.add_argument('--sqlite', help="Use this SQLite file instead of the MySQL database.")
+    parser.add_argument('--target', type=int, default=LATEST_VERSION, help="Stop after this migration version.")
+    parser.add_argument('--explain', action='store_true', help="Print the query plan for each indexed lookup afterwards.")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        db_manager = DatabaseManager.sqlite(args.sqlite)
+    else:
+        db_manager = DatabaseManager(db_host, db_username, db_password, db_name)
+    db_manager.connect()
+    try:
+        migrate(db_manager, args.target)
+        print(f"Schema version: {current_version(db_manager)}")
+        if args.explain:
+            for label, query, params in INDEX_CHECKS:
+                print(f"{label}:")
+                for row in explain(db_manager, query, params):
+                    print("   ", row)
+    finally:
+        db_manager.close_connection()
+
+
+if __name__ == '__main__':
+    main()
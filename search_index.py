@@ -0,0 +1,131 @@
+from array import array
+
+SEARCH_DEBOUNCE_MS = 150
+NGRAM_SIZE = 3
+# Entry numbers stay well below 2**31, so postings hold 4-byte ints rather than 8-byte ones.
+POSTING_TYPECODE = 'i'
+
+
+def ngrams(text):
+    return {text[start:start + NGRAM_SIZE] for start in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    def __init__(self):
+        self._keys = {}
+        self._entries = {}
+        self._postings = {}
+        self._next_entry = 0
+        self._dead_entries = 0
+        self._last_query = ""
+        self._last_result = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+        self._entries.clear()
+        self._postings.clear()
+        self._next_entry = 0
+        self._dead_entries = 0
+        self._last_query = ""
+        self._last_result = None
+
+    def add(self, key, fields):
+        if key in self._keys:
+            self.remove(key)
+
+        # Fields are joined with a separator no query can contain, so a match never spans two fields.
+        texts = [str(field).lower() for field in fields]
+        search_key = "\x00".join(texts)
+        entry = self._next_entry
+        self._next_entry += 1
+        self._keys[key] = (entry, search_key)
+        self._entries[entry] = key
+
+        grams = set()
+        for text in texts:
+            grams |= ngrams(text)
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array(POSTING_TYPECODE)
+            posting.append(entry)
+
+        if self._last_result is not None:
+            if self._last_query in search_key:
+                self._last_result[key] = None
+            else:
+                self._last_result.pop(key, None)
+
+    def remove(self, key):
+        found = self._keys.pop(key, None)
+        if found is None:
+            return
+        # Postings are append-only; stale entries are skipped at query time and purged in bulk.
+        del self._entries[found[0]]
+        self._dead_entries += 1
+        if self._dead_entries > 1000 and self._dead_entries > len(self._keys):
+            self._rebuild_postings()
+        if self._last_result is not None:
+            self._last_result.pop(key, None)
+
+    def search(self, query):
+        query = query.strip().lower()
+        if not query:
+            self._last_query = ""
+            self._last_result = None
+            return list(self._keys)
+
+        keys = self._keys
+        if self._last_result is not None and query.startswith(self._last_query):
+            candidates = self._last_result
+        else:
+            candidates = keys
+
+        posting = self._shortest_posting(query)
+        if posting is not None and len(posting) < len(candidates):
+            entries = self._entries
+            candidates = (entries[entry] for entry in posting if entry in entries)
+
+        result = {key: None for key in candidates if query in keys[key][1]}
+        self._last_query = query
+        self._last_result = result
+        return list(result)
+
+    def _shortest_posting(self, query):
+        if len(query) < NGRAM_SIZE:
+            return None
+        shortest = None
+        for gram in ngrams(query):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return array(POSTING_TYPECODE)
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        return shortest
+
+    def _rebuild_postings(self):
+        live = [(key, search_key.split("\x00")) for key, (_, search_key) in self._keys.items()]
+        last_query, last_result = self._last_query, self._last_result
+        self.clear()
+        for key, texts in live:
+            self.add(key, texts)
+        self._last_query, self._last_result = last_query, last_result
+
+
+def apply_treeview_filter(tree, order, attached, matches):
+    visible = set(matches)
+    hidden = [iid for iid in attached if iid not in visible]
+    if hidden:
+        tree.detach(*hidden)
+
+    if len(visible) > len(attached) - len(hidden):
+        index = 0
+        for iid in order:
+            if iid in visible:
+                if iid not in attached:
+                    tree.move(iid, '', index)
+                index += 1
+    return visible
@@ -0,0 +1,25 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_PATH = os.path.join(ROOT, 'CSC 151 Project.py')
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def project_module():
+    # The Tk app lives in a file whose name is not importable, so it is loaded by path, once per session.
+    spec = importlib.util.spec_from_file_location('csc151_project', PROJECT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def project(project_module, tmp_path, monkeypatch):
+    # The app reads and writes its CSV files in the working directory.
+    monkeypatch.chdir(tmp_path)
+    return project_module
@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from website import AsyncDatabaseManager, ConnectionPool, DatabaseManager
+
+
+class FakeConnection:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(size=2, is_alive=None):
+    opened = []
+
+    def factory():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    return ConnectionPool(factory, size, timeout=0.1, is_alive=is_alive), opened
+
+
+def test_connection_that_raised_a_database_error_is_not_reused():
+    pool, opened = make_pool()
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection():
+            raise sqlite3.OperationalError('server has gone away')
+    assert opened[0].closed
+    with pool.connection() as connection:
+        assert connection is opened[1]
+    assert pool.metrics()['discarded'] == 1
+    assert pool.metrics()['open'] == 1
+
+
+def test_other_errors_return_the_connection_to_the_pool():
+    pool, opened = make_pool()
+    with pytest.raises(ValueError):
+        with pool.connection():
+            raise ValueError('bad input')
+    with pool.connection() as connection:
+        assert connection is opened[0]
+
+
+def test_dead_idle_connection_is_replaced_on_acquire():
+    pool, opened = make_pool(is_alive=lambda connection: connection.alive)
+    with pool.connection():
+        pass
+    opened[0].alive = False
+    with pool.connection() as connection:
+        assert connection is opened[1]
+    assert opened[0].closed
+    assert pool.metrics()['open'] == 1
+
+
+def test_close_also_closes_connections_that_are_checked_out():
+    pool, opened = make_pool()
+    idle = pool.acquire()
+    busy = pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.closed and not busy.closed
+    pool.release(busy)
+    assert busy.closed
+    assert pool.metrics()['open'] == 0
+
+
+def test_async_manager_runs_more_workers_than_pooled_connections(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'students.db'), pool_size=2)
+    db_manager.connect()
+    async_db = AsyncDatabaseManager(db_manager, workers=4)
+    started = threading.Barrier(4, timeout=5)
+
+    def query():
+        # The barrier only opens with all four workers running; their queries then share two connections.
+        started.wait()
+        return db_manager.execute_query("SELECT 1", raise_errors=True)
+
+    async def run_all():
+        return await asyncio.gather(*(async_db.run(query) for _ in range(4)))
+
+    assert asyncio.run(run_all()) == [[(1,)]] * 4
+    async_db.close()
+    db_manager.close_connection()
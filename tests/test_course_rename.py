@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from migrations import migrate
+from website import DatabaseManager
+
+STUDENTS = 200
+RENAMES = 60
+READERS = 3
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'students.db'), pool_size=READERS + 1)
+    db_manager.connect()
+    migrate(db_manager)
+    db_manager.execute_query("INSERT INTO courses (course_code, course_name) VALUES (%s, %s)", ('BSCS', 'Computer Science'), raise_errors=True)
+    db_manager.execute_many("INSERT INTO students (id, first_name, middle_name, last_name, lvl, gender, course_code) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                            [(f'2020-{i:04d}', 'Juan', 'Santos', 'Cruz', 1, 'M', 'BSCS') for i in range(STUDENTS)])
+    yield db_manager
+    db_manager.close_connection()
+
+
+def test_rename_moves_students_with_the_course(db_manager):
+    db_manager.rename_course('BSCS', 'BSCOMSCI', 'Computer Science')
+    assert db_manager.execute_query("SELECT course_code FROM courses") == [('BSCOMSCI',)]
+    assert db_manager.execute_query("SELECT course_code, COUNT(*) FROM students GROUP BY course_code") == [('BSCOMSCI', STUDENTS)]
+
+
+def test_rename_of_missing_course_raises(db_manager):
+    with pytest.raises(ValueError):
+        db_manager.rename_course('NOPE', 'BSIT')
+
+
+def test_readers_never_see_a_half_renamed_course(db_manager):
+    done = threading.Event()
+    problems = []
+
+    def read():
+        while not done.is_set():
+            # Both reads share one transaction, so they see the same committed state.
+            with db_manager.transaction() as cursor:
+                cursor.execute("SELECT course_code FROM courses")
+                courses = [code for code, in cursor.fetchall()]
+                cursor.execute("SELECT course_code, COUNT(*) FROM students GROUP BY course_code")
+                groups = cursor.fetchall()
+            if len(courses) != 1 or groups != [(courses[0], STUDENTS)]:
+                problems.append((courses, groups))
+
+    readers = [threading.Thread(target=read) for _ in range(READERS)]
+    for reader in readers:
+        reader.start()
+    try:
+        codes = ('BSCS', 'BSCOMSCI')
+        for number in range(RENAMES):
+            db_manager.rename_course(codes[number % 2], codes[(number + 1) % 2])
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    assert problems == []
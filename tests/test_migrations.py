@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from migrations import INDEX_CHECKS, LATEST_VERSION, current_version, explain, migrate
+from website import DatabaseManager
+
+# The index SQLite's planner must pick for each INDEX_CHECKS query.
+EXPECTED_SQLITE_INDEXES = {
+    "student by id": 'sqlite_autoindex_students_1',
+    "students in course": 'idx_students_course_page',
+    "course page": 'idx_students_course_page',
+    "students by name": 'idx_students_name',
+    "courses by name": 'idx_courses_name',
+    "schema version": 'sqlite_autoindex_schema_version_1',
+}
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'students.db'))
+    db_manager.connect()
+    yield db_manager
+    db_manager.close_connection()
+
+
+def test_every_index_check_uses_its_index(db_manager):
+    migrate(db_manager)
+    assert {label for label, _, _ in INDEX_CHECKS} == set(EXPECTED_SQLITE_INDEXES)
+    for label, query, params in INDEX_CHECKS:
+        plan = ' '.join(row[-1] for row in explain(db_manager, query, params))
+        assert f"INDEX {EXPECTED_SQLITE_INDEXES[label]} " in f"{plan} ", f"{label}: {plan}"
+
+
+def test_upgrade_drops_the_redundant_course_code_index(db_manager):
+    migrate(db_manager, target=5)
+    db_manager.execute_query("CREATE INDEX idx_students_course_code ON students (course_code)", raise_errors=True)
+    migrate(db_manager)
+    assert current_version(db_manager) == LATEST_VERSION
+    assert not db_manager.index_exists('students', 'idx_students_course_code')
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from migrations import migrate
+from website import CourseManager, DatabaseManager, RecordCache, StudentManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_serves_cached_value_until_invalidated():
+    cache = RecordCache()
+    store = {'a': 1}
+    assert cache.get('a', lambda: store['a']) == 1
+    store['a'] = 2
+    assert cache.get('a', lambda: store['a']) == 1
+    cache.invalidate('a')
+    assert cache.get('a', lambda: store['a']) == 2
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = RecordCache(ttl=10, clock=clock)
+    cache.get('a', lambda: 1)
+    clock.now = 11
+    assert cache.get('a', lambda: 2) == 2
+    assert cache.stats()['expirations'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RecordCache(max_entries=2)
+    cache.get('a', lambda: 1)
+    cache.get('b', lambda: 2)
+    cache.get('a', lambda: 1)
+    cache.get('c', lambda: 3)
+    assert cache.get('a', lambda: 'reloaded') == 1
+    assert cache.get('b', lambda: 'reloaded') == 'reloaded'
+
+
+def test_value_loaded_across_an_invalidation_is_not_cached():
+    cache = RecordCache()
+    store = {'a': 'old'}
+    loading = threading.Event()
+    written = threading.Event()
+    results = []
+
+    def slow_load():
+        value = store['a']
+        loading.set()
+        written.wait()
+        return value
+
+    reader = threading.Thread(target=lambda: results.append(cache.get('a', slow_load)))
+    reader.start()
+    loading.wait()
+    # The write lands after the reader fetched the row but before it stored it in the cache.
+    store['a'] = 'new'
+    cache.invalidate('a')
+    written.set()
+    reader.join()
+
+    assert results == ['old']
+    assert cache.get('a', lambda: store['a']) == 'new'
+
+
+def test_clear_during_load_also_discards_the_loaded_value():
+    cache = RecordCache()
+
+    def load():
+        cache.clear()
+        return 'stale'
+
+    assert cache.get('a', load) == 'stale'
+    assert cache.get('a', lambda: 'fresh') == 'fresh'
+
+
+def test_concurrent_writes_never_leave_a_stale_entry():
+    cache = RecordCache()
+    store = {'a': 0}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def load():
+        with lock:
+            return store['a']
+
+    def read():
+        while not done.is_set():
+            cache.get('a', load)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for value in range(1, 2000):
+        # Writers update the row first and invalidate after, like the managers do.
+        with lock:
+            store['a'] = value
+        cache.invalidate('a')
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert cache.get('a', load) == store['a']
+
+
+@pytest.fixture
+def managers(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'students.db'))
+    db_manager.connect()
+    migrate(db_manager)
+    student_manager = StudentManager(db_manager)
+    course_manager = CourseManager(db_manager, student_cache=student_manager.cache)
+    course_manager.add_course('BSCS', 'Computer Science')
+    course_manager.add_course('BSIT', 'Information Technology')
+    student_manager.add_student('2020-0001', 'Juan', 'Santos', 'Cruz', '1', 'M', 'BSCS')
+    yield student_manager, course_manager
+    db_manager.close_connection()
+
+
+def test_student_reads_follow_every_mutation(managers):
+    student_manager, course_manager = managers
+    assert student_manager.get_student('2020-0001')[4] == 1
+
+    student_manager.update_student('2020-0001', 'Juan', 'Santos', 'Cruz', '2', 'M', 'BSCS')
+    assert student_manager.get_student('2020-0001')[4] == 2
+
+    student_manager.update_students_bulk([{'id_number': '2020-0001', 'first_name': 'Juan', 'middle_name': 'Santos', 'last_name': 'Cruz', 'lvl': '3', 'gender': 'M', 'course_code': 'BSIT'}])
+    assert student_manager.get_student('2020-0001')[4:] == (3, 'M', 'BSIT')
+
+    course_manager.rename_course('BSIT', 'BSINFOTECH')
+    assert student_manager.get_student('2020-0001')[6] == 'BSINFOTECH'
+
+    course_manager.delete_course('BSINFOTECH')
+    assert student_manager.get_student('2020-0001')[6] is None
+
+    student_manager.delete_student('2020-0001')
+    assert student_manager.get_student('2020-0001') is None
+
+
+def test_course_reads_follow_every_mutation(managers):
+    _, course_manager = managers
+    assert course_manager.get_course('BSCS') == ('BSCS', 'Computer Science')
+
+    course_manager.update_course('BSCS', 'Computing')
+    assert course_manager.get_course('BSCS') == ('BSCS', 'Computing')
+
+    course_manager.rename_course('BSCS', 'BSCOMP')
+    assert course_manager.get_course('BSCS') is None
+    assert course_manager.get_course('BSCOMP') == ('BSCOMP', 'Computing')
+
+    course_manager.delete_courses_bulk(['BSCOMP'])
+    assert course_manager.get_course('BSCOMP') is None
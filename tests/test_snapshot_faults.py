@@ -0,0 +1,64 @@
+import csv
+import random
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from conftest import PROJECT_PATH
+
+KILLS = 25
+
+# Writes snapshot after snapshot until it is killed. Snapshot n holds rows_in(n) rows whose first name spells n,
+# so a reader can tell which snapshot a file is and whether it is complete.
+WRITER = '''
+import importlib.util, os, sys
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+spec = importlib.util.spec_from_file_location('project', sys.argv[1])
+project = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(project)
+
+def spell(n):
+    return ''.join(chr(ord('A') + int(digit)) for digit in str(n))
+
+n = 0
+while True:
+    n += 1
+    students = [project.Student(f'{n % 10000:04d}-{i:04d}', spell(n), 'M', 'L', '1', 'F', 'BSCS') for i in range(2000 + n % 7)]
+    project.write_students_csv(students, n)
+    print(n, flush=True)
+'''
+
+
+def rows_in(n):
+    return 2000 + n % 7
+
+
+def check_complete_snapshot(path):
+    with open(path, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        rows = list(reader)
+    assert header[:7] == ["id", "first_name", "middle_name", "last_name", "lvl", "gender", "course_code"]
+    generation = int(header[7].split('=')[1])
+    spelled = ''.join(chr(ord('A') + int(digit)) for digit in str(generation))
+    assert len(rows) == rows_in(generation)
+    assert all(len(row) == 7 and row[1] == spelled for row in rows)
+    return generation
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGKILL'), reason="needs SIGKILL")
+def test_killed_writer_always_leaves_a_complete_snapshot(tmp_path):
+    rng = random.Random(151)
+    for _ in range(KILLS):
+        writer = subprocess.Popen([sys.executable, '-c', WRITER, PROJECT_PATH], cwd=tmp_path, stdout=subprocess.PIPE, text=True)
+        # Wait for one finished snapshot so every kill lands after the writer is up to speed.
+        writer.stdout.readline()
+        time.sleep(rng.uniform(0, 0.05))
+        writer.send_signal(signal.SIGKILL)
+        writer.wait()
+        writer.stdout.close()
+
+        assert check_complete_snapshot(tmp_path / 'students.csv') >= 1
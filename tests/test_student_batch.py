@@ -0,0 +1,67 @@
+import random
+import threading
+
+import pytest
+
+pytest.importorskip('mysql.connector')
+
+from migrations import migrate
+from website import DatabaseManager, StudentManager
+
+
+@pytest.fixture
+def student_manager(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'students.db'))
+    db_manager.connect()
+    migrate(db_manager)
+    db_manager.execute_query("INSERT INTO courses (course_code, course_name) VALUES (%s, %s)", ('BSCS', 'Computer Science'), raise_errors=True)
+    yield StudentManager(db_manager)
+    db_manager.close_connection()
+
+
+def student(id_number, course_code='BSCS', lvl=1):
+    return {'id_number': id_number, 'first_name': 'Juan', 'middle_name': 'Santos', 'last_name': 'Cruz', 'lvl': lvl, 'gender': 'Male', 'course_code': course_code}
+
+
+def test_course_code_is_matched_and_stored_upper_case(student_manager):
+    results = student_manager.add_students_bulk([student('2020-0001', course_code=' bscs ')])
+    assert results == [{'id': '2020-0001', 'ok': True, 'error': None}]
+    assert student_manager.db_manager.execute_query("SELECT course_code FROM students") == [('BSCS',)]
+
+
+def test_rejected_row_does_not_block_a_later_row_with_the_same_id(student_manager):
+    results = student_manager.add_students_bulk([student('2020-0001', lvl=9), student('2020-0001'), student('2020-0001')])
+    assert [result['ok'] for result in results] == [False, True, False]
+    assert results[2]['error'] == "ID number appears more than once in this batch"
+    assert student_manager.db_manager.execute_query("SELECT id, lvl FROM students") == [('2020-0001', 1)]
+
+
+def test_concurrent_writes_keep_enrollment_counts_exact(tmp_path):
+    db_manager = DatabaseManager.sqlite(str(tmp_path / 'pooled.db'), pool_size=4)
+    db_manager.connect()
+    migrate(db_manager)
+    db_manager.execute_many("INSERT INTO courses (course_code, course_name) VALUES (%s, %s)", [('BSCS', 'Computer Science'), ('BSIT', 'Information Technology')])
+    student_manager = StudentManager(db_manager)
+    student_manager.add_students_bulk([student(f'2020-{i:04d}') for i in range(10)])
+    student_manager.enrollment_counts()
+
+    def writer(seed):
+        rng = random.Random(seed)
+        for _ in range(40):
+            id_number = f'2020-{rng.randrange(10):04d}'
+            if rng.random() < 0.5:
+                student_manager.update_student(id_number, 'Juan', 'Santos', 'Cruz', str(rng.randint(1, 6)), 'M', rng.choice(['BSCS', 'BSIT']))
+            else:
+                student_manager.update_students_bulk([student(id_number, rng.choice(['BSCS', 'BSIT']), rng.randint(1, 6))])
+
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    student_manager.delete_student('2020-0000')
+    student_manager.delete_students_bulk(['2020-0001', '2020-0002'])
+
+    assert student_manager.check_enrollment_counts() == []
+    assert student_manager.enrollment_counts().total == 7
+    db_manager.close_connection()
@@ -0,0 +1,131 @@
+import os
+import shutil
+
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def app(project, tmp_path, monkeypatch):
+    for name in ('students.csv', 'courses.csv'):
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    # Journal appends, snapshots and course saves run inline instead of on the worker thread.
+    monkeypatch.setattr(project, 'student_journal', project.StudentJournal())
+    monkeypatch.setattr(project.persistence, 'submit', lambda task, key=None, message=None: task() or False)
+    return project
+
+
+def reload(app):
+    app.student_journal = app.StudentJournal()
+    return app.load_students_from_csv()
+
+
+def rows(app, students):
+    return [app.student_row(student) for student in students]
+
+
+def names(students, id_number):
+    return sorted(student.first_name for student in students if student.id == id_number)
+
+
+def test_course_rename_moves_every_duplicate_id(app):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    assert app.rename_course(students, courses, 'BSCE', 'BSCEX', 'CIVIL ENGINEERING')
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
+    assert names(reloaded, '2018-0135') == ['Emma', 'Luke']
+    assert names(reloaded, '2021-0126') == ['Harper', 'Layla']
+    assert not reloaded.students_in_course('BSCE')
+
+
+def test_course_delete_clears_every_duplicate_id(app):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    assert app.delete_course(students, courses, 'BSCE')
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
+    assert names(reloaded, '2018-0135') == ['Emma', 'Luke']
+    assert not reloaded.students_in_course('BSCE')
+
+
+def test_add_edit_and_delete_hit_the_exact_duplicate(app):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    assert app.add_students_bulk(students, courses, [('2024-0001', 'NEW', 'STUDENT', 'ONE', '1', 'F', 'BSCS')]) == [None]
+
+    luke = [student for student in students if student.id == '2018-0135'][1]
+    edited = app.Student('2018-0135', 'LUCAS', luke.middle_name, luke.last_name, '5', luke.gender, luke.course_code)
+    assert app.update_student(students, luke, edited)
+
+    harper = [student for student in students if student.id == '2021-0126'][1]
+    assert app.delete_student(students, harper.id, students.position(harper))
+
+    # An ID change moves the second record of a duplicate pair under a new ID.
+    aurora = [student for student in students if student.id == '2020-0111'][1]
+    moved = app.Student('2024-0002', aurora.first_name, aurora.middle_name, aurora.last_name, aurora.lvl, aurora.gender, aurora.course_code)
+    assert app.update_student(students, aurora, moved)
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
+    assert names(reloaded, '2018-0135') == ['Emma', 'LUCAS']
+    assert names(reloaded, '2021-0126') == ['Layla']
+    assert names(reloaded, '2020-0111') == ['Olivia']
+    assert names(reloaded, '2024-0002') == ['Aurora']
+
+
+def test_crash_between_snapshot_and_journal_truncate(app):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    app.rename_course(students, courses, 'BSCE', 'BSCEX', 'CIVIL ENGINEERING')
+    harper = [student for student in students if student.id == '2021-0126'][1]
+    app.delete_student(students, harper.id, students.position(harper))
+    with open('students.journal') as journal_file:
+        journal = journal_file.read()
+
+    # The snapshot lands but the crash comes before the journal is emptied.
+    app.student_journal.compact(students)
+    with open('students.journal', 'w') as journal_file:
+        journal_file.write(journal)
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
+    assert names(reloaded, '2021-0126') == ['Layla']
+
+
+def test_torn_final_entry_is_skipped(app):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    app.delete_student(students, '2020-0111', 0)
+    with open('students.journal', 'a') as journal_file:
+        journal_file.write('D,1,2018-0135')
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
+
+
+def test_unreadable_header_never_overwrites_the_file(app):
+    with open('students.csv') as csvfile:
+        original = csvfile.read().replace('gender', 'sex', 1)
+    with open('students.csv', 'w') as csvfile:
+        csvfile.write(original)
+
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    assert len(students) == 0
+    assert app.add_students_bulk(students, courses, [('2024-0001', 'NEW', 'STUDENT', 'ONE', '1', 'F', 'BSCS')]) == [None]
+    app.student_journal.compact(students)
+
+    reloaded = reload(app)
+    with open('students.csv') as csvfile:
+        assert csvfile.read() == original
+    assert names(reloaded, '2024-0001') == ['NEW']
+
+
+def test_bulk_add_is_one_journal_write(app, monkeypatch):
+    students, courses = app.load_students_from_csv(), app.load_courses_from_csv()
+    fsyncs = []
+    monkeypatch.setattr(app.os, 'fsync', fsyncs.append)
+    batch = [(f'2024-{number:04d}', 'NEW', 'STUDENT', 'ROW', '1', 'F', 'BSCS') for number in range(500)]
+    assert app.add_students_bulk(students, courses, batch) == [None] * 500
+    assert len(fsyncs) == 1
+
+    reloaded = reload(app)
+    assert rows(app, reloaded) == rows(app, students)
@@ -0,0 +1,119 @@
+from tkinter import ttk
+
+VISIBLE_BUFFER = 10
+DEFAULT_ROW_HEIGHT = 20
+EXTEND_SELECTION_STATE = 0x0001 | 0x0004  # Shift or Control held
+
+
+class VirtualTreeview:
+    def __init__(self, tree, scrollbar, row_values):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.rows = []
+        self.offset = 0
+        self._items = []
+        self._item_rows = {}
+        # Selected rows by identity, kept apart from the items so a selection survives scrolling out of view.
+        self._selected = {}
+
+        row_height = ttk.Style(tree).lookup('Treeview', 'rowheight')
+        self._row_height = int(row_height) if row_height else DEFAULT_ROW_HEIGHT
+        self._visible_rows = int(tree.cget('height'))
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        for sequence in ('<Button-1>', '<Up>', '<Down>'):
+            self.tree.bind(sequence, self._on_replace_selection)
+        self.tree.bind('<Configure>', self._on_configure)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        if self._selected:
+            present = {id(row) for row in rows}
+            self._selected = {key: row for key, row in self._selected.items() if key in present}
+        self.offset = min(self.offset, self._max_offset())
+        self.render()
+
+    def row_for(self, iid):
+        return self._item_rows.get(iid)
+
+    def selected_rows(self):
+        return list(self._selected.values())
+
+    def render(self):
+        window = self.rows[self.offset:self.offset + self._visible_rows + VISIBLE_BUFFER]
+
+        # Existing items are reused in place so a scroll only rewrites their values.
+        self._item_rows = {}
+        reselect = []
+        for position, row in enumerate(window):
+            values = self.row_values(row)
+            if position < len(self._items):
+                iid = self._items[position]
+                self.tree.item(iid, values=values)
+            else:
+                iid = self.tree.insert('', 'end', values=values)
+                self._items.append(iid)
+            self._item_rows[iid] = row
+            if id(row) in self._selected:
+                reselect.append(iid)
+
+        surplus = self._items[len(window):]
+        if surplus:
+            self.tree.delete(*surplus)
+            del self._items[len(window):]
+        self.tree.selection_set(reselect)
+        self._update_scrollbar()
+
+    def scroll(self, amount):
+        offset = max(0, min(self.offset + amount, self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+        return 'break'
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.offset = max(0, min(int(float(args[1]) * len(self.rows)), self._max_offset()))
+            self.render()
+        elif args[0] == 'scroll':
+            step = self._visible_rows if args[2] == 'pages' else 1
+            self.scroll(int(args[1]) * step)
+
+    def _max_offset(self):
+        return max(0, len(self.rows) - self._visible_rows)
+
+    def _update_scrollbar(self):
+        if not self.rows:
+            self.scrollbar.set(0, 1)
+            return
+        total = len(self.rows)
+        self.scrollbar.set(self.offset / total, min(1, (self.offset + self._visible_rows) / total))
+
+    def _on_select(self, event):
+        # Only rows in the window can change here; selected rows scrolled out of view are left alone.
+        chosen = set(self.tree.selection())
+        for iid, row in self._item_rows.items():
+            if iid in chosen:
+                self._selected[id(row)] = row
+            else:
+                self._selected.pop(id(row), None)
+
+    def _on_replace_selection(self, event):
+        # A plain click or arrow key replaces the selection, so rows selected out of view are dropped first.
+        if not event.state & EXTEND_SELECTION_STATE:
+            self._selected = {id(row): row for row in self._item_rows.values() if id(row) in self._selected}
+
+    def _on_configure(self, event):
+        # The heading row takes roughly one row of the widget height.
+        visible_rows = max(1, event.height // self._row_height - 1)
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self.render()
+
+    def _on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
@@ -3,6 +3,20 @@ from tkinter import ttk
 import mysql.connector
 import tkinter.messagebox as messagebox
 import re
+import sys
+import sqlite3
+import queue
+import threading
+import time
+import asyncio
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from enrollment_counts import EnrollmentCounts
+from migrations import FULLTEXT_INDEXES, migrate
+from search_index import SEARCH_DEBOUNCE_MS
+from virtual_treeview import VirtualTreeview
 
 GENDER_VALUES = {
     "Male": "M",
@@ -10,8 +24,26 @@ GENDER_VALUES = {
     "Other": "O"
 }
 
+DATABASE_ERRORS = (mysql.connector.Error, sqlite3.Error)
+SEARCH_RESULT_LIMIT = 500
+POOL_TIMEOUT = 10
+ASYNC_DB_WORKERS = 16
+RECORD_CACHE_SIZE = 1024
+RECORD_CACHE_TTL = 60
+FULLTEXT_TERM = re.compile(r'\w+')
+# InnoDB does not index words shorter than innodb_ft_min_token_size (3 by default).
+FULLTEXT_MIN_TERM = 3
+READ_QUERY = re.compile(r'^\s*(SELECT|SHOW|DESCRIBE|EXPLAIN)\b', re.IGNORECASE)
+STUDENT_SEARCH_COLUMNS = ('id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code')
+COURSE_SEARCH_COLUMNS = ('course_code', 'course_name')
+TAB_POLL_MS = 50
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
 
 class Student:
+    __slots__ = ('id', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code')
+
     def __init__(self, id, first_name, middle_name, last_name, lvl, gender, course_code):
         self.id = id
         self.first_name = first_name
@@ -47,11 +79,11 @@ class Student:
 
         if gender not in ('Male', 'Female', 'Other'):
             raise ValueError("Gender must be one of 'Male', 'Female', or 'Other'.")
-        self.gender = gender
+        self.gender = sys.intern(gender)
 
         if not course_code:
             raise ValueError("Course code cannot be empty.")
-        self.course_code = course_code
+        self.course_code = sys.intern(course_code)
 
 class Course:
     def __init__(self, course_code, course_name):
@@ -61,44 +93,395 @@ class Course:
     def __str__(self):
         return f'Course Code: {self.course_code}, Course Name: {self.course_name}'
 
+def is_duplicate_key_error(error):
+    if isinstance(error, sqlite3.IntegrityError):
+        return 'UNIQUE' in str(error)
+    return getattr(error, 'errno', None) == 1062
+
+class DataVersion:
+    def __init__(self):
+        self.version = 0
+        self.last_modified = time.time()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            # HTTP dates have one-second resolution, so each bump moves to a later second.
+            self.last_modified = max(time.time(), int(self.last_modified) + 1)
+            return self.version
+
+class RecordCache:
+    def __init__(self, max_entries=RECORD_CACHE_SIZE, ttl=RECORD_CACHE_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, load):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        value = load()
+        with self._lock:
+            # A write that invalidated anything while the row was loading may have made it stale.
+            if value is not None and generation == self._generation:
+                self._entries[key] = (value, self.clock() + self.ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+class PoolTimeoutError(Exception):
+    pass
+
+class ConnectionPool:
+    def __init__(self, connection_factory, size, timeout=POOL_TIMEOUT, is_alive=None):
+        self.connection_factory = connection_factory
+        self.size = size
+        self.timeout = timeout
+        # Checked on every idle connection handed out; a dead one is replaced instead of returned.
+        self.is_alive = is_alive
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self.in_use = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.discarded = 0
+
+    def acquire(self):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._create_or_wait()
+        if self.is_alive is not None and not self.is_alive(connection):
+            self._discard(connection)
+            connection = self._create_or_wait()
+        with self._lock:
+            self.in_use += 1
+        return connection
+
+    def _create_or_wait(self):
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self.connection_factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        start = time.perf_counter()
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(f"No database connection available after {self.timeout} seconds.")
+        finally:
+            with self._lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+
+    def release(self, connection, broken=False):
+        with self._lock:
+            self.in_use -= 1
+            closed = self._closed
+        if broken or closed:
+            self._discard(connection)
+        else:
+            self._idle.put(connection)
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except DATABASE_ERRORS:
+            pass
+        with self._lock:
+            self._created -= 1
+            self.discarded += 1
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        except DATABASE_ERRORS:
+            # The error may have left the connection unusable, so it is closed rather than handed out again.
+            self.release(connection, broken=True)
+            raise
+        except BaseException:
+            self.release(connection)
+            raise
+        else:
+            self.release(connection)
+
+    def metrics(self):
+        with self._lock:
+            return {'size': self.size, 'open': self._created, 'in_use': self.in_use, 'waits': self.waits, 'wait_time': self.wait_time, 'discarded': self.discarded}
+
+    def close(self):
+        # Connections still checked out are closed as they come back.
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._lock:
+                self._created -= 1
+
+def open_sqlite(path):
+    connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    # SQLite leaves foreign keys, and so ON UPDATE CASCADE, off unless each connection asks for them.
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
 class DatabaseManager:
-    def __init__(self, host, username, password, database):
+    def __init__(self, host, username, password, database, connection_factory=None, dialect='mysql', pool_size=None, pool_timeout=POOL_TIMEOUT):
         self.host = host
         self.username = username
         self.password = password
         self.database = database
+        self.connection_factory = connection_factory
+        self.dialect = dialect
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
         self.connection = None
+        self.pool = None
+        self.data_version = DataVersion()
+        self.enrollment = None
+        self._connection_lock = threading.RLock()
+
+    @classmethod
+    def sqlite(cls, path, pool_size=None, pool_timeout=POOL_TIMEOUT):
+        return cls(None, None, None, path, connection_factory=lambda: open_sqlite(path), dialect='sqlite', pool_size=pool_size, pool_timeout=pool_timeout)
+
+    def open_connection(self):
+        if self.connection_factory:
+            return self.connection_factory()
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.username,
+            password=self.password,
+            database=self.database,
+            autocommit=True
+        )
 
     def connect(self):
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.username,
-                password=self.password,
-                database=self.database
-            )
-            print("Connected to MySQL database")
-        except mysql.connector.Error as e:
-            print(f"Error connecting to MySQL database: {e}")
-
-    def execute_query(self, query, params=None):
-        if not self.connection:
+            if self.pool_size:
+                # MySQL drops idle connections after wait_timeout, so pooled ones are pinged before reuse.
+                is_alive = (lambda connection: connection.is_connected()) if self.dialect == 'mysql' else None
+                self.pool = ConnectionPool(self.open_connection, self.pool_size, self.pool_timeout, is_alive)
+                with self.pool.connection():
+                    pass
+            else:
+                self.connection = self.open_connection()
+            print(f"Connected to {self.dialect} database")
+        except DATABASE_ERRORS as e:
+            self.pool = None
+            print(f"Error connecting to {self.dialect} database: {e}")
+
+    @contextmanager
+    def checkout(self):
+        if self.pool:
+            with self.pool.connection() as connection:
+                yield connection
+        else:
+            with self._connection_lock:
+                yield self.connection
+
+    def pool_metrics(self):
+        return self.pool.metrics() if self.pool else None
+
+    def prepare_query(self, query):
+        if self.dialect == 'sqlite':
+            return query.replace('%s', '?')
+        return query
+
+    def execute_query(self, query, params=None, raise_errors=False):
+        if not self.connection and not self.pool:
             print("Error: Database connection is not established.")
             return None
 
-        cursor = self.connection.cursor()
         try:
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            result = cursor.fetchall()  
-            self.connection.commit()
-            return result
-        except mysql.connector.Error as e:
+            with self.checkout() as connection, closing(connection.cursor()) as cursor:
+                if params:
+                    cursor.execute(self.prepare_query(query), params)
+                else:
+                    cursor.execute(self.prepare_query(query))
+                result = cursor.fetchall() if cursor.description else []
+                if not READ_QUERY.match(query):
+                    connection.commit()
+                return result
+        except DATABASE_ERRORS as e:
+            if raise_errors:
+                raise
             print(f"Error executing query: {e}")
             return None
-        
+        except PoolTimeoutError as e:
+            if raise_errors:
+                raise
+            print(f"Error executing query: {e}")
+            return None
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        # BEGIN IMMEDIATE takes SQLite's write lock up front, so a read-then-write transaction cannot deadlock on upgrade.
+        begin = "BEGIN IMMEDIATE" if immediate else "BEGIN"
+        with self.checkout() as connection, closing(connection.cursor()) as cursor:
+            cursor.execute(begin if self.dialect == 'sqlite' else "START TRANSACTION")
+            try:
+                yield cursor
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+
+    def execute_many(self, query, rows):
+        with self.transaction() as cursor:
+            cursor.executemany(self.prepare_query(query), rows)
+            return cursor.rowcount
+
+    def existing_values(self, table, column, values, chunk_size=500):
+        return set(self.rows_by_key(table, column, (), values, chunk_size))
+
+    def rows_by_key(self, table, key, columns, values, chunk_size=500, cursor=None):
+        values = list(dict.fromkeys(value for value in values if value is not None))
+        selected = ', '.join((key,) + tuple(columns))
+        # Read through a transaction's cursor, the rows stay locked until it commits; SQLite's BEGIN IMMEDIATE already holds the write lock.
+        lock = " FOR UPDATE" if cursor is not None and self.dialect == 'mysql' else ""
+        found = {}
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            query = f"SELECT {selected} FROM {table} WHERE {key} IN ({placeholders}){lock}"
+            if cursor is None:
+                rows = self.execute_query(query, tuple(chunk))
+            else:
+                cursor.execute(self.prepare_query(query), tuple(chunk))
+                rows = cursor.fetchall()
+            found.update((row[0], tuple(row[1:])) for row in rows or ())
+        return found
+
+    def iter_query(self, query, params=None, batch_size=1000):
+        # mysql.connector cursors are unbuffered by default, so rows stream from the server as they are fetched.
+        with self.checkout() as connection, closing(connection.cursor()) as cursor:
+            cursor.execute(self.prepare_query(query), params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+
+    def search_students(self, keyword, limit=SEARCH_RESULT_LIMIT):
+        return self.search_table('students', STUDENT_SEARCH_COLUMNS, keyword, limit)
+
+    def search_courses(self, keyword, limit=SEARCH_RESULT_LIMIT):
+        return self.search_table('courses', COURSE_SEARCH_COLUMNS, keyword, limit)
+
+    def search_table(self, table, columns, keyword, limit):
+        keyword = keyword.strip()
+        if not keyword:
+            return self.execute_query(f"SELECT * FROM {table} LIMIT %s", (limit,))
+
+        terms = FULLTEXT_TERM.findall(keyword)
+        if self.dialect == 'mysql' and terms and min(map(len, terms)) >= FULLTEXT_MIN_TERM:
+            # Every word must start some indexed word, which the FULLTEXT index answers without a table scan.
+            _, fulltext_columns = FULLTEXT_INDEXES[table]
+            query = f"SELECT * FROM {table} WHERE MATCH({', '.join(fulltext_columns)}) AGAINST (%s IN BOOLEAN MODE) LIMIT %s"
+            return self.execute_query(query, (' '.join(f'+{term}*' for term in terms), limit))
+
+        # A leading wildcard cannot use a B-tree index, so this path scans; it still sends back only matches.
+        pattern = '%' + keyword.replace('!', '!!').replace('%', '!%').replace('_', '!_') + '%'
+        predicates = " OR ".join(f"{column} LIKE %s ESCAPE '!'" for column in columns)
+        query = f"SELECT * FROM {table} WHERE {predicates} LIMIT %s"
+        return self.execute_query(query, (pattern,) * len(columns) + (limit,))
+
+    def fetch_page(self, table, key, columns, filters=None, after=None, limit=PAGE_SIZE):
+        # Keyset pagination: each page seeks past the last key instead of scanning an OFFSET.
+        conditions = []
+        params = []
+        for column, value in (filters or {}).items():
+            conditions.append(f"{column} = %s")
+            params.append(value)
+        if after is not None:
+            conditions.append(f"{key} > %s")
+            params.append(after)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT {', '.join(columns)} FROM {table}{where} ORDER BY {key} LIMIT %s"
+        rows = self.execute_query(query, tuple(params) + (limit + 1,)) or []
+
+        next_after = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after = rows[-1][columns.index(key)]
+        return [dict(zip(columns, row)) for row in rows], next_after
+
+    def index_exists(self, table, index_name):
+        if self.dialect == 'sqlite':
+            query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+            params = (table, index_name)
+        else:
+            query = "SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1"
+            params = (self.database, table, index_name)
+        return bool(self.execute_query(query, params))
+
+    def ensure_schema(self):
+        if not self.connection and not self.pool:
+            return False
+        try:
+            return bool(migrate(self))
+        except (*DATABASE_ERRORS, PoolTimeoutError) as e:
+            print(f"Error migrating database: {e}")
+            return False
+
     def get_students(self):
         query = "SELECT * FROM students"
         return self.execute_query(query)
@@ -107,64 +490,103 @@ class DatabaseManager:
         query = "SELECT * FROM courses"
         return self.execute_query(query)
     
-    def update_course_code_simultaneously(self, old_course_code, new_course_code):
-        try:
-            self.execute_query("SET FOREIGN_KEY_CHECKS=0")
-
-            self.update_course_code(old_course_code, new_course_code)
-
-            query = "UPDATE students SET course_code = %s WHERE course_code = %s"
-            params = (new_course_code, old_course_code)
-            self.execute_query(query, params)
-
-
-            self.execute_query("SET FOREIGN_KEY_CHECKS=1")
-        except Exception as e:
-            print(f"Error updating course codes simultaneously: {e}")
-
-    def update_course_code(self, old_course_code, new_course_code):
-        try:
-            query = "UPDATE courses SET course_code = %s WHERE course_code = %s"
-            params = (new_course_code, old_course_code)
-            self.execute_query(query, params)
+    def rename_course(self, old_course_code, new_course_code, course_name=None):
+        # fk_course_code is ON UPDATE CASCADE, so the students move in the same statement and transaction as
+        # the course. Only the course row and its students are locked; foreign key checks stay on throughout.
+        lock_query = "SELECT course_code FROM courses WHERE course_code = %s"
+        if self.dialect == 'mysql':
+            lock_query += " FOR UPDATE"
+        with self.transaction(immediate=True) as cursor:
+            cursor.execute(self.prepare_query(lock_query), (old_course_code,))
+            if not cursor.fetchall():
+                raise ValueError(f"Course {old_course_code} does not exist.")
+            if course_name is None:
+                cursor.execute(self.prepare_query("UPDATE courses SET course_code = %s WHERE course_code = %s"), (new_course_code, old_course_code))
+            else:
+                cursor.execute(self.prepare_query("UPDATE courses SET course_code = %s, course_name = %s WHERE course_code = %s"), (new_course_code, course_name, old_course_code))
 
-        except Exception as e:
-            print(f"Error updating course code: {e}")
+        if self.enrollment is not None:
+            self.enrollment.move_course(old_course_code, new_course_code, self.enrollment.course_count(old_course_code))
+        self.data_version.bump()
 
     def update_course_name(self, course_code, new_course_name):
         query = "UPDATE courses SET course_name = %s WHERE course_code = %s"
         params = (new_course_name, course_code)
         self.execute_query(query, params)
+        self.data_version.bump()
 
     def close_connection(self):
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            print("Database connection pool closed.")
         if self.connection:
             self.connection.close()
             print("Database connection closed.")
     
-    def add_foreign_key_constraint(self):
-        query = "SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS WHERE CONSTRAINT_NAME = 'fk_course_code' AND CONSTRAINT_SCHEMA = %s"
-        params = (self.database,)
-        result = self.execute_query(query, params)
-        if result and result[0][0] > 0:
-            print("Foreign key constraint 'fk_course_code' already exists.")
-            return
-
-        query = "ALTER TABLE students ADD CONSTRAINT fk_course_code FOREIGN KEY (course_code) REFERENCES courses(course_code) ON DELETE SET NULL"
-        self.execute_query(query)
-    
-
-
-db_host = 'localhost'
-db_username = 'root'
-db_password = 'password' 
-db_name = 'mydb'  
-db_manager = DatabaseManager(db_host, db_username, db_password, db_name)
-db_manager.connect()
-db_manager.add_foreign_key_constraint()
+class AsyncDatabaseManager:
+    # Blocking driver calls run on a thread pool so awaiting callers never stall the event loop.
+    # Its size is independent of the connection pool: workers beyond the pool's connections
+    # wait in checkout, which pool_metrics() reports, and an unpooled manager shares one locked connection.
+    def __init__(self, db_manager, workers=ASYNC_DB_WORKERS):
+        self.db_manager = db_manager
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='db')
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+ENROLLMENT_COLUMNS = ('course_code', 'lvl', 'gender')
+STUDENT_ROW_FIELDS = ('id_number', 'first_name', 'middle_name', 'last_name', 'lvl', 'gender', 'course_code')
+
+REQUIRED_STUDENT_FIELDS = ('id_number', 'first_name', 'last_name', 'lvl', 'gender', 'course_code')
+
+def json_scalar(value):
+    # Batch rows come from JSON; lists, objects and booleans are treated as missing so validation rejects them.
+    return value if isinstance(value, (str, int, float)) and not isinstance(value, bool) else None
+
+def validate_student_row(row):
+    missing = [field for field in REQUIRED_STUDENT_FIELDS if row[field] in (None, '')]
+    if missing:
+        return f"Missing {', '.join(missing)}."
+    if not re.match(r'^20\d{2}-\d{4}$', str(row['id_number'])):
+        return "Invalid ID format. Please use the format '20XX-XXXX'."
+    lvl = str(row['lvl'])
+    if not (lvl.isdigit() and 1 <= int(lvl) <= 6):
+        return "Invalid level. Please enter a number between 1 and 6."
+    if row['gender'] not in GENDER_VALUES.values():
+        return "Gender must be one of 'M', 'F' or 'O'."
+    return None
+
+def page_columns(columns, key, fields=None):
+    # Only whitelisted columns reach the SQL; the key is always returned so the next cursor can be built.
+    if not fields:
+        return list(columns)
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return [key] + [column for column in columns if column in fields and column != key]
+
+def enrollment_key(row):
+    return (row['course_code'], row['lvl'], row['gender'])
+
+def batch_result(key, error=None):
+    return {'id': key, 'ok': error is None, 'error': error}
+
+def course_row(row):
+    values = row if isinstance(row, dict) else {}
+    code, name = json_scalar(values.get('course_code')), json_scalar(values.get('course_name'))
+    return (str(code).strip().upper() if code is not None else '', str(name).strip().title() if name is not None else '')
 
 class StudentManager:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, cache=None):
         self.db_manager = db_manager
+        self.cache = cache or RecordCache()
 
     def add_student(self, id_number, first_name, middle_name, last_name, lvl, gender, course_code):
         try:
@@ -175,27 +597,36 @@ class StudentManager:
             if not course_exists_result:
                 raise ValueError("Course code does not exist in the courses table.")
 
-            existing_students = self.db_manager.get_students()
-            if existing_students:
-                for student in existing_students:
-                    if student[0] == id_number:
-                        raise ValueError("ID number already exists")
+            if self.student_exists(id_number):
+                raise ValueError("ID number already exists")
 
             query = "INSERT INTO students (id, first_name, middle_name, last_name, lvl, gender, course_code) VALUES (%s, %s, %s, %s, %s, %s, %s)"
             params = (id_number, first_name, middle_name, last_name, lvl, gender, course_code)
-            self.db_manager.execute_query(query, params)
+            self.db_manager.execute_query(query, params, raise_errors=True)
+            self._count_enrollment(added=[(course_code, lvl, gender)])
+            self.cache.invalidate(id_number)
+            self.db_manager.data_version.bump()
         except ValueError as e:
             messagebox.showerror("Error", str(e))
-        except mysql.connector.Error as e:
-            if e.errno == 1265 and e.sqlstate == '01000':
+        except DATABASE_ERRORS as e:
+            # The primary key still catches a duplicate inserted between the check and the insert.
+            if is_duplicate_key_error(e):
+                messagebox.showerror("Error", "ID number already exists")
+            elif getattr(e, 'errno', None) == 1265 and getattr(e, 'sqlstate', None) == '01000':
                 messagebox.showerror("Error", "Data truncated for column 'gender'. Make sure gender data matches the column definition.")
             else:
                 messagebox.showerror("Error", f"Database error: {e}")
 
+    def student_exists(self, id_number):
+        query = "SELECT 1 FROM students WHERE id = %s LIMIT 1"
+        return bool(self.db_manager.execute_query(query, (id_number,)))
+
     def delete_student(self, id_number):
         query = "DELETE FROM students WHERE id = %s"
         params = (id_number,)
-        self.db_manager.execute_query(query, params)
+        self._write_student(query, params, id_number)
+        self.cache.invalidate(id_number)
+        self.db_manager.data_version.bump()
 
     def update_student(self, id_number, first_name, middle_name, last_name, lvl, gender, course_code):
         try:
@@ -212,7 +643,9 @@ class StudentManager:
 
             query = "UPDATE students SET first_name = %s, middle_name = %s, last_name = %s, lvl = %s, gender = %s, course_code = %s WHERE id = %s"
             params = (first_name, middle_name, last_name, lvl, gender, course_code, id_number)
-            self.db_manager.execute_query(query, params)
+            self._write_student(query, params, id_number, added=[(course_code, lvl, gender)])
+            self.cache.invalidate(id_number)
+            self.db_manager.data_version.bump()
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
@@ -227,10 +660,142 @@ class StudentManager:
             return students
         return []
 
+    def enrollment_counts(self):
+        # Loaded with one GROUP BY on first use, then kept current by every write below.
+        if self.db_manager.enrollment is None:
+            self.db_manager.enrollment = self.recount_enrollment()
+        return self.db_manager.enrollment
+
+    def recount_enrollment(self):
+        query = "SELECT course_code, lvl, gender, COUNT(*) FROM students GROUP BY course_code, lvl, gender"
+        return EnrollmentCounts(self.db_manager.execute_query(query) or ())
+
+    def check_enrollment_counts(self):
+        return self.enrollment_counts().differences(self.recount_enrollment())
+
+    def _enrollment_before(self, id_numbers, cursor=None):
+        if self.db_manager.enrollment is None:
+            return {}
+        return self.db_manager.rows_by_key('students', 'id', ENROLLMENT_COLUMNS, id_numbers, cursor=cursor)
+
+    def _write_student(self, query, params, id_number, added=()):
+        # The old row is read in the same transaction as the write, so a concurrent change cannot skew the counts.
+        try:
+            with self.db_manager.transaction(immediate=True) as cursor:
+                before = self._enrollment_before([id_number], cursor)
+                cursor.execute(self.db_manager.prepare_query(query), params)
+        except (*DATABASE_ERRORS, PoolTimeoutError) as e:
+            print(f"Error executing query: {e}")
+            return
+        if before:
+            self._count_enrollment(removed=before.values(), added=added)
+
+    def _count_enrollment(self, removed=(), added=()):
+        counts = self.db_manager.enrollment
+        if counts is None:
+            return
+        for key in removed:
+            counts.remove(*key)
+        for key in added:
+            counts.add(*key)
+
+    def get_student(self, id_number):
+        query = "SELECT * FROM students WHERE id = %s"
+        return self.cache.get(id_number, lambda: next(iter(self.db_manager.execute_query(query, (id_number,)) or ()), None))
+
+    def get_students_page(self, after=None, limit=PAGE_SIZE, course_code=None, lvl=None, gender=None, fields=None):
+        filters = {}
+        if course_code:
+            filters['course_code'] = course_code
+        if lvl:
+            filters['lvl'] = str(lvl)
+        if gender:
+            filters['gender'] = GENDER_VALUES.get(gender, gender)
+        return self.db_manager.fetch_page('students', 'id', page_columns(STUDENT_SEARCH_COLUMNS, 'id', fields), filters, after, limit)
+
+    def _normalize_rows(self, rows):
+        normalized = []
+        for row in rows:
+            values = row if isinstance(row, dict) else {}
+            row = {field: json_scalar(values.get(field)) for field in STUDENT_ROW_FIELDS}
+            row['gender'] = GENDER_VALUES.get(row['gender'], row['gender'])
+            # Course codes are stored upper-case, as course_row does for the course batch endpoints.
+            if row['course_code'] is not None:
+                row['course_code'] = str(row['course_code']).strip().upper()
+            normalized.append(row)
+        return normalized
+
+    def _validate_batch(self, rows, must_exist):
+        ids = [row['id_number'] for row in rows]
+        existing_ids = self.db_manager.existing_values('students', 'id', ids)
+        existing_courses = self.db_manager.existing_values('courses', 'course_code', [row['course_code'] for row in rows])
+        errors = []
+        seen = set()
+        for row in rows:
+            error = validate_student_row(row)
+            if error is None and row['id_number'] in seen:
+                error = "ID number appears more than once in this batch"
+            elif error is None and must_exist and row['id_number'] not in existing_ids:
+                error = "Student not found"
+            elif error is None and not must_exist and row['id_number'] in existing_ids:
+                error = "ID number already exists"
+            elif error is None and row['course_code'] not in existing_courses:
+                error = "Course code does not exist in the courses table."
+            # A rejected row is not written, so it does not make a later row with the same ID a duplicate.
+            if error is None:
+                seen.add(row['id_number'])
+            errors.append(error)
+        return errors
+
+    def _write_batch(self, query, rows, errors, params, enrollment_change):
+        valid = [row for row, error in zip(rows, errors) if error is None]
+        if valid:
+            try:
+                # Rows the counts depend on are read inside the write's transaction, as _write_student does.
+                with self.db_manager.transaction(immediate=True) as cursor:
+                    removed, added = enrollment_change(valid, cursor)
+                    cursor.executemany(self.db_manager.prepare_query(query), [params(row) for row in valid])
+                self._count_enrollment(removed, added)
+                self.cache.invalidate(*(row['id_number'] for row in rows))
+                self.db_manager.data_version.bump()
+            except DATABASE_ERRORS as e:
+                # The batch is one transaction, so a failure leaves none of its rows written.
+                errors = [error or f"Database error: {e}" for error in errors]
+        return [batch_result(row['id_number'], error) for row, error in zip(rows, errors)]
+
+    def add_students_bulk(self, rows):
+        rows = self._normalize_rows(rows)
+        errors = self._validate_batch(rows, must_exist=False)
+        query = "INSERT INTO students (id, first_name, middle_name, last_name, lvl, gender, course_code) VALUES (%s, %s, %s, %s, %s, %s, %s)"
+        return self._write_batch(query, rows, errors, lambda row: tuple(row[field] for field in STUDENT_ROW_FIELDS),
+                                 lambda valid, cursor: ((), [enrollment_key(row) for row in valid]))
+
+    def update_students_bulk(self, rows):
+        rows = self._normalize_rows(rows)
+        errors = self._validate_batch(rows, must_exist=True)
+        query = "UPDATE students SET first_name = %s, middle_name = %s, last_name = %s, lvl = %s, gender = %s, course_code = %s WHERE id = %s"
+
+        def enrollment_change(valid, cursor):
+            before = self._enrollment_before([row['id_number'] for row in valid], cursor)
+            return before.values(), [enrollment_key(row) for row in valid if row['id_number'] in before]
+
+        return self._write_batch(query, rows, errors, lambda row: tuple(row[field] for field in STUDENT_ROW_FIELDS[1:]) + (row['id_number'],), enrollment_change)
+
+    def delete_students_bulk(self, id_numbers):
+        rows = [{'id_number': id_number} for id_number in id_numbers]
+        existing = self.db_manager.existing_values('students', 'id', id_numbers)
+        errors = [None if id_number in existing else "Student not found" for id_number in id_numbers]
+        query = "DELETE FROM students WHERE id = %s"
+        return self._write_batch(query, rows, errors, lambda row: (row['id_number'],),
+                                 lambda valid, cursor: (self._enrollment_before([row['id_number'] for row in valid], cursor).values(), ()))
+
 
 class CourseManager:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, cache=None, student_cache=None):
         self.db_manager = db_manager
+        self.cache = cache or RecordCache()
+        # Deleting a course rewrites its students' course_code, so their cached rows go too.
+        self.student_cache = student_cache
 
     def add_course(self, course_code, course_name):
         course_code = course_code.upper()
@@ -238,6 +803,38 @@ class CourseManager:
         query = "INSERT INTO courses (course_code, course_name) VALUES (%s, %s)"
         params = (course_code, course_name)
         self.db_manager.execute_query(query, params)
+        self.cache.invalidate(course_code)
+        self.db_manager.data_version.bump()
+
+    def update_course(self, course_code, course_name):
+        course_code = course_code.upper()
+        course_name = course_name.title()
+        query = "UPDATE courses SET course_name = %s WHERE course_code = %s"
+        params = (course_name, course_code)
+        self.db_manager.execute_query(query, params)
+        self.cache.invalidate(course_code)
+        self.db_manager.data_version.bump()
+
+    def rename_course(self, old_course_code, new_course_code, course_name=None):
+        new_course_code = new_course_code.upper()
+        if course_name is not None:
+            course_name = course_name.title()
+        self.db_manager.rename_course(old_course_code, new_course_code, course_name)
+        self.cache.invalidate(old_course_code, new_course_code)
+        if self.student_cache is not None:
+            self.student_cache.clear()
+
+    def get_course(self, course_code):
+        query = "SELECT * FROM courses WHERE course_code = %s"
+        return self.cache.get(course_code, lambda: next(iter(self.db_manager.execute_query(query, (course_code,)) or ()), None))
+
+    def _students_left_courses(self, course_codes):
+        if self.student_cache is not None:
+            self.student_cache.clear()
+        counts = self.db_manager.enrollment
+        if counts is not None:
+            for course_code in course_codes:
+                counts.move_course(course_code, None, counts.course_count(course_code))
 
     def delete_course(self, course_code):
         update_query = "UPDATE students SET course_code = NULL WHERE course_code = %s"
@@ -245,11 +842,58 @@ class CourseManager:
 
         delete_query = "DELETE FROM courses WHERE course_code = %s"
         self.db_manager.execute_query(delete_query, (course_code,))
+        self.cache.invalidate(course_code)
+        self._students_left_courses([course_code])
+        self.db_manager.data_version.bump()
+
+    def add_courses_bulk(self, rows):
+        rows = [course_row(row) for row in rows]
+        existing = self.db_manager.existing_values('courses', 'course_code', [code for code, _ in rows])
+        errors = []
+        seen = set()
+        for code, name in rows:
+            if not code:
+                errors.append("Course code cannot be empty.")
+            elif not name:
+                errors.append("Course name cannot be empty.")
+            elif code in existing or code in seen:
+                errors.append("Course code already exists")
+            else:
+                errors.append(None)
+            seen.add(code)
+        valid = [row for row, error in zip(rows, errors) if error is None]
+        if valid:
+            try:
+                self.db_manager.execute_many("INSERT INTO courses (course_code, course_name) VALUES (%s, %s)", valid)
+                self.cache.invalidate(*(code for code, _ in valid))
+                self.db_manager.data_version.bump()
+            except DATABASE_ERRORS as e:
+                errors = [error or f"Database error: {e}" for error in errors]
+        return [batch_result(code, error) for (code, _), error in zip(rows, errors)]
+
+    def delete_courses_bulk(self, course_codes):
+        existing = self.db_manager.existing_values('courses', 'course_code', course_codes)
+        errors = [None if code in existing else "Course not found" for code in course_codes]
+        valid = [(code,) for code, error in zip(course_codes, errors) if error is None]
+        if valid:
+            try:
+                with self.db_manager.transaction() as cursor:
+                    cursor.executemany(self.db_manager.prepare_query("UPDATE students SET course_code = NULL WHERE course_code = %s"), valid)
+                    cursor.executemany(self.db_manager.prepare_query("DELETE FROM courses WHERE course_code = %s"), valid)
+                self.cache.invalidate(*(code for code, in valid))
+                self._students_left_courses([code for code, in valid])
+                self.db_manager.data_version.bump()
+            except DATABASE_ERRORS as e:
+                errors = [error or f"Database error: {e}" for error in errors]
+        return [batch_result(code, error) for code, error in zip(course_codes, errors)]
             
     def get_courses(self):
         query = "SELECT * FROM courses"
         return self.db_manager.execute_query(query)
 
+    def get_courses_page(self, after=None, limit=PAGE_SIZE, fields=None):
+        return self.db_manager.fetch_page('courses', 'course_code', page_columns(COURSE_SEARCH_COLUMNS, 'course_code', fields), None, after, limit)
+
 class AddStudentDialog:
     def __init__(self, parent):
         self.top = tk.Toplevel(parent)
@@ -460,16 +1104,16 @@ class UpdateCourseDialog:
 
         if new_course_code != self.original_course_data[0]:
             try:
-                db_manager.update_course_code_simultaneously(self.original_course_data[0], new_course_code)
+                db_manager.rename_course(self.original_course_data[0], new_course_code, new_course_name)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to update course code: {e}")
                 return
-
-        try:
-            db_manager.update_course_name(new_course_code, new_course_name)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update course name: {e}")
-            return
+        else:
+            try:
+                db_manager.update_course_name(new_course_code, new_course_name)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to update course name: {e}")
+                return
 
         self.top.destroy()
         app.reload_students()
@@ -477,9 +1121,14 @@ class UpdateCourseDialog:
 
 
 class Front:
-    def __init__(self, root, db_manager):
+    def __init__(self, root, db_manager, lazy=False):
         self.root = root
         self.db_manager = db_manager
+        self.lazy = lazy
+        self.ready = threading.Event()
+        self._results = queue.Queue()
+        self._load_ids = {}
+        self._loaded_tabs = set()
         self.student_manager = StudentManager(db_manager)
         self.course_manager = CourseManager(db_manager)
         self.root.title("Student and Course Viewer")
@@ -492,6 +1141,8 @@ class Front:
         self.notebook.add(self.student_tab, text='View Students')
         self.notebook.add(self.course_tab, text='View Courses')
 
+        self._student_search_job = None
+        self._course_search_job = None
         self.student_search_var = tk.StringVar()
         self.student_search_var.trace_add('write', self.filter_students)
         self.student_search_entry = ttk.Entry(self.student_tab, textvariable=self.student_search_var)
@@ -504,7 +1155,11 @@ class Front:
 
         self.student_label = ttk.Label(self.student_tab, text='Student Information')
         self.student_label.pack(pady=10)
-        self.student_tree = ttk.Treeview(self.student_tab, columns=('ID', 'First Name', 'Middle Name', 'Last Name', 'Level', 'Gender', 'Course Code'), show='headings')
+        self.student_tree_frame = ttk.Frame(self.student_tab)
+        self.student_tree_frame.pack(fill='both', expand=True)
+        self.student_scrollbar = ttk.Scrollbar(self.student_tree_frame, orient='vertical')
+        self.student_scrollbar.pack(side='right', fill='y')
+        self.student_tree = ttk.Treeview(self.student_tree_frame, columns=('ID', 'First Name', 'Middle Name', 'Last Name', 'Level', 'Gender', 'Course Code'), show='headings')
         self.student_tree.heading('ID', text='ID')
         self.student_tree.heading('First Name', text='First Name')
         self.student_tree.heading('Middle Name', text='Middle Name')
@@ -512,7 +1167,8 @@ class Front:
         self.student_tree.heading('Level', text='Level')
         self.student_tree.heading('Gender', text='Gender')
         self.student_tree.heading('Course Code', text='Course Code')
-        self.student_tree.pack(fill='both', expand=True)
+        self.student_tree.pack(side='left', fill='both', expand=True)
+        self.student_view = VirtualTreeview(self.student_tree, self.student_scrollbar, lambda row: row)
 
         self.student_buttons_frame = ttk.Frame(self.student_tab)
         self.student_buttons_frame.pack(pady=10)
@@ -539,47 +1195,114 @@ class Front:
         self.edit_course_button = ttk.Button(self.course_buttons_frame, text='Edit', command=self.edit_course)
         self.edit_course_button.grid(row=0, column=2, padx=5)
 
-        self.load_students()
-        self.load_courses()
+        if lazy:
+            self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        else:
+            self.ready.set()
+            self.load_students()
+            self.load_courses()
 
-    def reload_students(self):
-        for row in self.student_tree.get_children():
-            self.student_tree.delete(row)
+    def start(self):
+        # The window is already up; connecting and the schema check happen off the Tk thread.
+        def connect():
+            try:
+                self.db_manager.connect()
+                self.db_manager.ensure_schema()
+            finally:
+                self.ready.set()
+
+        threading.Thread(target=connect, daemon=True).start()
+        self.root.after(TAB_POLL_MS, self.poll_results)
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        tab = self.notebook.select()
+        if tab in self._loaded_tabs:
+            return
+        self._loaded_tabs.add(tab)
+        if tab == str(self.student_tab):
+            self.student_label.configure(text='Loading students...')
+            self.load_in_background('students', self.fetch_students, self.show_students)
+        elif tab == str(self.course_tab):
+            self.course_label.configure(text='Loading courses...')
+            self.load_in_background('courses', self.fetch_courses, self.show_courses)
 
+    def _next_load_id(self, name):
+        self._load_ids[name] = self._load_ids.get(name, 0) + 1
+        return self._load_ids[name]
+
+    def load_in_background(self, name, fetch, show):
+        load_id = self._next_load_id(name)
+
+        def task():
+            self.ready.wait()
+            self._results.put((name, load_id, show, fetch()))
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def poll_results(self):
+        while True:
+            try:
+                name, load_id, show, rows = self._results.get_nowait()
+            except queue.Empty:
+                break
+            # A reload started on the Tk thread since then already shows newer rows.
+            if self._load_ids.get(name) == load_id:
+                show(rows)
+        self.root.after(TAB_POLL_MS, self.poll_results)
+
+    def reload_students(self):
         students = self.db_manager.get_students()
-        if students:
-            for student in students:
-                self.student_tree.insert('', 'end', values=student)
+        self.student_view.set_rows(students or [])
 
     def filter_students(self, *args):
-        search_keyword = self.student_search_var.get().strip().lower()
+        if self._student_search_job is not None:
+            self.root.after_cancel(self._student_search_job)
+        self._student_search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_student_filter)
 
-        for row in self.student_tree.get_children():
-            self.student_tree.delete(row)
+    def apply_student_filter(self):
+        if not self.ready.is_set():
+            self._student_search_job = self.root.after(TAB_POLL_MS, self.apply_student_filter)
+            return
+        self._student_search_job = None
+        search_keyword = self.student_search_var.get().strip()
+        if not search_keyword:
+            self.load_students()
+            return
 
-        students = self.db_manager.get_students()
-        if students:
-            for student in students:
-                if any(search_keyword in str(field).lower() for field in student):
-                    self.student_tree.insert('', 'end', values=student)
+        students = self.db_manager.search_students(search_keyword)
+        self.student_view.set_rows(list(students or []))
 
     def filter_courses(self, *args):
-        search_keyword = self.course_search_var.get().strip().lower()
+        if self._course_search_job is not None:
+            self.root.after_cancel(self._course_search_job)
+        self._course_search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.apply_course_filter)
+
+    def apply_course_filter(self):
+        if not self.ready.is_set():
+            self._course_search_job = self.root.after(TAB_POLL_MS, self.apply_course_filter)
+            return
+        self._course_search_job = None
+        search_keyword = self.course_search_var.get().strip()
+        if not search_keyword:
+            self.load_courses()
+            return
 
         for row in self.course_tree.get_children():
             self.course_tree.delete(row)
 
-        courses = self.db_manager.get_courses()
+        courses = self.db_manager.search_courses(search_keyword)
         if courses:
             for course in courses:
-                if any(search_keyword in str(field).lower() for field in course):
-                    self.course_tree.insert('', 'end', values=course)
+                self.course_tree.insert('', 'end', values=course)
 
     def load_students(self):
-        for row in self.student_tree.get_children():
-            self.student_tree.delete(row)
+        self._next_load_id('students')
+        self.show_students(self.fetch_students())
 
+    def fetch_students(self):
         students = self.db_manager.get_students()
+        rows = []
         if students:
             for student in students:
                 gender = student[5]
@@ -591,16 +1314,27 @@ class Front:
                     gender = 'Other'
                 student = list(student)
                 student[5] = gender
-                self.student_tree.insert('', 'end', values=student)
+                rows.append(student)
+        return rows
+
+    def show_students(self, rows):
+        self.student_label.configure(text='Student Information')
+        self.student_view.set_rows(rows)
 
     def load_courses(self):
+        self._next_load_id('courses')
+        self.show_courses(self.fetch_courses())
+
+    def fetch_courses(self):
+        return self.db_manager.get_courses() or []
+
+    def show_courses(self, courses):
+        self.course_label.configure(text='Course Information')
         for row in self.course_tree.get_children():
             self.course_tree.delete(row)
 
-        courses = self.db_manager.get_courses()
-        if courses:
-            for course in courses:
-                self.course_tree.insert('', 'end', values=course)
+        for course in courses:
+            self.course_tree.insert('', 'end', values=course)
     
     def add_student(self):
         dialog = AddStudentDialog(self.root)
@@ -609,26 +1343,26 @@ class Front:
         self.load_students()
 
     def delete_student(self):
-        selected_item = self.student_tree.selection()
-        if not selected_item:
+        selected_rows = self.student_view.selected_rows()
+        if not selected_rows:
             messagebox.showerror("Error", "Please select a student to delete.")
             return
 
         confirm = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this student?")
         if confirm:
-            student_id = self.student_tree.item(selected_item)['values'][0]
+            student_id = selected_rows[0][0]
 
             self.student_manager.delete_student(student_id)
 
             self.load_students()
 
     def edit_student(self):
-        selected_item = self.student_tree.selection()
-        if not selected_item:
+        selected_rows = self.student_view.selected_rows()
+        if not selected_rows:
             messagebox.showerror("Error", "Please select a student to edit.")
             return
 
-        student_data = self.student_tree.item(selected_item)['values']
+        student_data = list(selected_rows[0])
 
         dialog = UpdateStudentDialog(self.root, student_data)
         self.root.wait_window(dialog.top)
@@ -670,6 +1404,15 @@ class Front:
         self.root.wait_window(dialog.top)  
         self.load_courses() 
 
-root = tk.Tk()
-app = Front(root, db_manager)
-root.mainloop()
+db_host = 'localhost'
+db_username = 'root'
+db_password = 'password' 
+db_name = 'mydb'  
+
+if __name__ == "__main__":
+    db_manager = DatabaseManager(db_host, db_username, db_password, db_name)
+
+    root = tk.Tk()
+    app = Front(root, db_manager, lazy=True)
+    app.start()
+    root.mainloop()